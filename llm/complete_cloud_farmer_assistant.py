@@ -223,7 +223,6 @@ class CompleteCloudFarmerAssistant:
     def cloud_audio_processing(self):
         """Audio processing with cloud pipeline integration"""
         import queue
-        import json
         import numpy as np
         
         last_partial = ""
@@ -209,7 +209,6 @@ class CompleteFarmerAssistant:
     def integrated_audio_processing(self):
         """Audio processing with complete pipeline integration"""
         import queue
-        import json
         import numpy as np
         
         last_partial = ""
@@ -10,6 +10,27 @@ import time
 import json
 
 
+# Farmer-specific system prompt. Sent first and byte-identical on every call
+# so Groq can reuse the cached prompt prefix: never format dynamic values
+# (date, names) into it, put them in the user message instead, and bump
+# SYSTEM_PROMPT_VERSION whenever the text is changed on purpose.
+SYSTEM_PROMPT_VERSION = 1
+SYSTEM_PROMPT = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
+    
+आपकी विशेषताएं:
+- बीज, खाद, कीटनाशक की सलाह
+- फसल रोग की पहचान और इलाज  
+- मंडी भाव और बिक्री की सलाह
+- मौसम के अनुसार खेती की सलाह
+- सरकारी योजनाओं की जानकारी
+
+जवाब हमेशा:
+- हिंदी में दें
+- 3-4 वाक्यों में संक्षिप्त हो
+- तुरंत लागू होने वाला हो
+- व्यावहारिक और उपयोगी हो"""
+
+
 def load_env():
     """Load .env file"""
     if os.path.exists('.env'):
@@ -30,22 +51,6 @@ def get_farming_response(user_query):
     if not api_key:
         return "❌ No Groq API key found. Please add it to .env file"
     
-    # Farmer-specific system prompt
-    system_prompt = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
-    
-आपकी विशेषताएं:
-- बीज, खाद, कीटनाशक की सलाह
-- फसल रोग की पहचान और इलाज  
-- मंडी भाव और बिक्री की सलाह
-- मौसम के अनुसार खेती की सलाह
-- सरकारी योजनाओं की जानकारी
-
-जवाब हमेशा:
-- हिंदी में दें
-- 3-4 वाक्यों में संक्षिप्त हो
-- तुरंत लागू होने वाला हो
-- व्यावहारिक और उपयोगी हो"""
-
     try:
         url = "https://api.groq.com/openai/v1/chat/completions"
         headers = {
@@ -56,7 +61,7 @@ def get_farming_response(user_query):
         payload = {
             "model": "llama3-70b-8192",
             "messages": [
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_query}
             ],
             "temperature": 0.7,
@@ -76,7 +81,8 @@ def get_farming_response(user_query):
                 "success": True,
                 "response": llm_response,
                 "response_time": response_time,
-                "provider": "groq"
+                "provider": "groq",
+                "prompt_version": SYSTEM_PROMPT_VERSION
             }
         else:
             return {
@@ -220,7 +220,6 @@ class IntegratedFarmerAssistant:
     def integrated_audio_processing(self):
         """Modified audio processing with NLP integration"""
         import queue
-        import json
         import numpy as np
         
         last_partial = ""
@@ -6,6 +6,7 @@ Includes noise reduction, audio filtering, and advanced processing
 
 import json
 import queue
+import re
 import threading
 import time
 import os
@@ -64,7 +65,6 @@ class EnhancedSTT:
         
         # Audio processing buffers
         self.noise_sample = None
-        self.audio_buffer = deque(maxlen=10)  # Keep last 10 chunks for noise estimation
         self.volume_history = deque(maxlen=20)  # Volume history for adaptive gain
         
         # Audio filters
@@ -73,6 +73,20 @@ class EnhancedSTT:
         # Post-processing
         self.confidence_threshold = 0.7
         self.min_word_length = 2
+
+        # Whitespace-delimited tokens long enough to keep (plus "i"/"a"),
+        # matched in a single regex pass over the recognized text
+        self._token_re = re.compile(
+            r'(?<!\S)(?:[ia]|\S{' + str(self.min_word_length) + r',})(?!\S)',
+            re.IGNORECASE
+        )
+
+        # Common corrections for English ("" removes filler words)
+        self._corrections = {
+            "uh": "", "um": "", "ah": "",
+            "gonna": "going to", "wanna": "want to",
+            "gotta": "got to", "kinda": "kind of"
+        }
         
     def setup_audio_filters(self):
         """Setup audio filters for preprocessing"""
@@ -299,11 +313,12 @@ class EnhancedSTT:
             print(f"Audio status: {status}")
 
         try:
-            # Convert to numpy array
-            audio_array = np.frombuffer(indata, dtype=np.float32).copy()
-
-            # Store in buffer for noise estimation
-            self.audio_buffer.append(audio_array)
+            # The stream is opened as mono float32, so view the PortAudio
+            # buffer in place. No copy is needed: every consumer below either
+            # reads it or produces a new array (estimate_noise copies before
+            # keeping a reference).
+            assert len(indata) == frames * 4
+            audio_array = np.frombuffer(indata, dtype=np.float32)
 
             # Estimate noise from quiet periods
             self.estimate_noise(audio_array)
@@ -323,34 +338,16 @@ class EnhancedSTT:
         if not text:
             return text
 
-        # 1. Basic cleaning
-        text = text.strip()
-
-        # 2. Remove very short words (likely noise)
-        words = text.split()
-        filtered_words = [w for w in words if len(w) >= self.min_word_length or w.lower() in ['i', 'a']]
+        # 1. Tokenize, dropping very short words (likely noise)
+        words = self._token_re.findall(text)
 
-        # 3. Common corrections for English
+        # 2. Common corrections for English
         if self.selected_language == "en":
-            corrections = {
-                "uh": "", "um": "", "ah": "",  # Remove filler words
-                "gonna": "going to", "wanna": "want to",
-                "gotta": "got to", "kinda": "kind of"
-            }
-
-            for i, word in enumerate(filtered_words):
-                if word.lower() in corrections:
-                    replacement = corrections[word.lower()]
-                    if replacement:
-                        filtered_words[i] = replacement
-                    else:
-                        filtered_words[i] = ""  # Remove word
-
-        # 4. Rejoin and clean
-        result = " ".join([w for w in filtered_words if w])
-        result = " ".join(result.split())  # Remove extra spaces
+            corrections = self._corrections
+            words = [corrections.get(w.lower(), w) for w in words]
 
-        return result
+        # 3. Rejoin, skipping removed words
+        return " ".join([w for w in words if w])
 
     def process_audio_enhanced(self):
         """Enhanced audio processing with confidence scoring"""
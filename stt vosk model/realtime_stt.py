@@ -5,7 +5,12 @@ Supports Hindi, Marathi, Tamil, and English languages
 Works entirely offline with local Vosk models
 """
 
+import ctypes
+import ctypes.util
+import functools
 import json
+import math
+import mmap
 import queue
 import sys
 import threading
@@ -17,6 +22,90 @@ import sounddevice as sd
 import vosk
 import numpy as np
 
+NUMBA_AVAILABLE = False
+ORJSON_AVAILABLE = False
+
+try:
+    from numba import njit  # Optional JIT for the audio callback kernel
+    NUMBA_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    import orjson  # Optional faster parser for Vosk's JSON results
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Vosk's cffi FFI, used to pass ring frames to AcceptWaveform without a copy
+_vosk_ffi = getattr(vosk, '_ffi', None)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _apply_gain_i16(src, gain_q8, dst):
+        """Apply a Q8 fixed-point gain to int16 audio with saturation in a single pass"""
+        for i in range(src.shape[0]):
+            v = (np.int32(src[i]) * gain_q8 + 128) >> 8
+            if v > 32767:
+                v = 32767
+            elif v < -32768:
+                v = -32768
+            dst[i] = np.int16(v)
+
+
+class AudioRingBuffer:
+    """Single-producer/single-consumer ring of preallocated int16 audio frames
+
+    The audio callback fills the frame returned by acquire() and publishes it
+    with commit(); the processing thread reads the published frames with
+    get() and hands the slots back with release(). No frame is allocated after construction, and
+    wakeups go through a queue.SimpleQueue whose put/get are implemented in C.
+    """
+
+    def __init__(self, block_size, slots=16):
+        """Allocate all frames up front"""
+        self.slots = slots
+        self.frames = np.zeros((slots, block_size), dtype=np.int16)
+        self.head = 0  # Frames published (written by the producer only)
+        self.tail = 0  # Frames released (written by the consumer only)
+        self.dropped = 0
+        self._ready = queue.SimpleQueue()  # One token per published frame
+
+    def acquire(self):
+        """Return the next free frame, or None if the consumer is a full ring behind"""
+        if self.head - self.tail >= self.slots:
+            self.dropped += 1
+            return None
+        return self.frames[self.head % self.slots]
+
+    def commit(self):
+        """Publish the frame returned by acquire()"""
+        self.head += 1
+        self._ready.put(None)
+
+    def get(self, timeout=None):
+        """Return every published frame that is contiguous in the ring
+
+        The result is a (count, block_size) view, oldest frame first, so a
+        consumer that fell behind can handle the backlog in one go. Raises
+        queue.Empty if nothing is published within timeout. The frames stay
+        owned by the consumer until release() is called.
+        """
+        self._ready.get(timeout=timeout)
+        start = self.tail % self.slots
+        count = min(self.head - self.tail, self.slots - start)
+        # Consume the tokens of the extra frames (each is put right after head moves)
+        for _ in range(count - 1):
+            self._ready.get()
+        return self.frames[start:start + count]
+
+    def release(self, count=1):
+        """Hand frames returned by get() back to the producer"""
+        self.tail += count
+
 
 class RealtimeSTT:
     """Real-time Speech-to-Text application using Vosk library"""
@@ -51,13 +140,38 @@ class RealtimeSTT:
         self.selected_language = None
         self.model = None
         self.recognizer = None
-        self.audio_queue = queue.Queue()
         self.is_running = False
+
+        # Default model loaded in the background during language selection
+        self.default_language = "en"
+        self._prefetched = {}
+        self._prefetch_thread = None
+
+        # Optionally keep the other installed models locked in RAM (Linux only);
+        # enabled with VOSK_PIN_MODELS=1
+        self.pin_models = os.environ.get("VOSK_PIN_MODELS", "").lower() in ("1", "true", "yes")
+        self._mapped = []
         
         # Audio configuration
         self.sample_rate = 16000
-        self.block_size = 4000  # Smaller blocks for better responsiveness
+        self.block_size = 8000  # 500 ms blocks halve the callback rate
         self.audio_gain = 10.0  # Amplify audio signal
+
+        # Preallocated frames handed from audio_callback to process_audio
+        self.audio_queue = AudioRingBuffer(self.block_size)
+
+        # Scratch buffer for the gain when numba is not available
+        self._i32_scratch = np.empty(self.block_size, dtype=np.int32)
+        # Scratch buffer for the volume level (used by process_audio only)
+        self._level_scratch = np.empty(self.block_size, dtype=np.float32)
+
+        # Every possible volume bar, indexed by filled length
+        self.bar_length = 20
+        self._bars = ['█' * i + '-' * (self.bar_length - i) for i in range(self.bar_length + 1)]
+
+        # Latest level published by process_audio for display_levels
+        self._latest_volume = 0.0
+        self._volume_updates = 0
         
     def display_welcome(self):
         """Display welcome message and available languages"""
@@ -87,28 +201,144 @@ class RealtimeSTT:
                 print("\n👋 Goodbye!")
                 return False
                 
-    def check_model_exists(self, model_path):
-        """Check if the Vosk model exists at the specified path"""
-        if not os.path.exists(model_path):
-            return False
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def check_model_exists(model_path):
+        """Check if the Vosk model exists at the specified path
 
+        Results are cached per path, and each directory is read once with
+        os.scandir instead of stat-ing every entry separately.
+        """
         # Check if it's a valid Vosk model directory
-        # Different models have different structures, so check for key directories
-        required_dirs = ['am', 'conf']
-        for dir_name in required_dirs:
-            if not os.path.exists(os.path.join(model_path, dir_name)):
+        # Different models have different structures, so check for key
+        # directories and the essential file inside each of them
+        required = {'am': 'final.mdl', 'conf': 'mfcc.conf'}
+        try:
+            with os.scandir(model_path) as it:
+                dirs = {entry.name for entry in it if entry.is_dir()}
+            if not dirs.issuperset(required):
                 return False
 
-        # Check for essential files
-        essential_files = [
-            os.path.join('am', 'final.mdl'),
-            os.path.join('conf', 'mfcc.conf')
-        ]
-        for file_path in essential_files:
-            if not os.path.exists(os.path.join(model_path, file_path)):
-                return False
+            for dir_name, file_name in required.items():
+                with os.scandir(os.path.join(model_path, dir_name)) as it:
+                    if not any(entry.name == file_name for entry in it):
+                        return False
+        except OSError:
+            return False
         return True
         
+    def start_prefetch(self):
+        """Start loading the default model while the user picks a language"""
+        model_path = self.language_models[self.default_language]["model_path"]
+        if not self.check_model_exists(model_path):
+            return
+
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch_model, args=(self.default_language, model_path), daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def _prefetch_model(self, language, model_path):
+        """Load a model into the prefetch cache (runs in a background thread)"""
+        try:
+            model = vosk.Model(model_path)
+        except Exception:
+            return  # load_model() loads it again and reports the error
+
+        # vosk.Model() cannot be interrupted, so a prefetch overtaken by a
+        # different language choice is dropped as soon as it finishes
+        if self.selected_language in (None, language):
+            self._prefetched[language] = model
+
+    @staticmethod
+    def warm_page_cache(model_path):
+        """Ask the OS to read a model's files ahead into the page cache
+
+        Uses POSIX_FADV_WILLNEED, which only schedules readahead, so the later
+        vosk.Model() call finds the files already in memory. No-op on
+        platforms without posix_fadvise (e.g. Windows).
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+
+        pending = [model_path]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        fd = os.open(entry.path, os.O_RDONLY)
+                        try:
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                        finally:
+                            os.close(fd)
+                except OSError:
+                    continue
+
+    def start_cache_warmup(self):
+        """Warm the page cache for the other installed models in the background"""
+        model_paths = [
+            info["model_path"] for code, info in self.language_models.items()
+            if code != self.default_language and self.check_model_exists(info["model_path"])
+        ]
+        if not model_paths:
+            return
+
+        def warm_all():
+            for model_path in model_paths:
+                self.warm_page_cache(model_path)
+
+        threading.Thread(target=warm_all, daemon=True).start()
+
+    def pin_other_models(self):
+        """Map the other installed models' am/ and graph/ files and mlock them
+
+        Keeps those models resident so switching language later does not hit
+        the disk again. Needs enough RAM and RLIMIT_MEMLOCK; stops quietly at
+        the first file that cannot be locked.
+        """
+        if not sys.platform.startswith('linux'):
+            return
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        except OSError:
+            return
+
+        for code, info in self.language_models.items():
+            model_path = info["model_path"]
+            if code == self.selected_language or not self.check_model_exists(model_path):
+                continue
+
+            for dir_name in ('am', 'graph'):
+                try:
+                    with os.scandir(os.path.join(model_path, dir_name)) as it:
+                        paths = [entry.path for entry in it if entry.is_file()]
+                except OSError:
+                    continue
+
+                for path in paths:
+                    try:
+                        with open(path, 'rb') as f:
+                            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    except (OSError, ValueError):
+                        continue  # Unreadable or empty file
+
+                    pages = np.frombuffer(mapped, dtype=np.uint8)
+                    if libc.mlock(ctypes.c_void_p(pages.ctypes.data), ctypes.c_size_t(pages.size)) != 0:
+                        print(f"\n⚠️ Could not pin models in memory: {os.strerror(ctypes.get_errno())}")
+                        del pages
+                        mapped.close()
+                        return
+                    self._mapped.append((mapped, pages))
+
     def load_model(self):
         """Load the Vosk model for the selected language"""
         if not self.selected_language:
@@ -129,13 +359,21 @@ class RealtimeSTT:
             return False
             
         try:
-            # Load the model
-            self.model = vosk.Model(model_path)
+            # Reuse the prefetched model, waiting for it if it is still loading
+            if self._prefetch_thread and self.selected_language == self.default_language:
+                self._prefetch_thread.join()
+            self.model = self._prefetched.pop(self.selected_language, None)
+            # A prefetched model for another language is never used
+            self._prefetched.clear()
+            if self.model is None:
+                self.model = vosk.Model(model_path)
             self.sample_rate = lang_info["sample_rate"]
             
             # Create recognizer
             self.recognizer = vosk.KaldiRecognizer(self.model, self.sample_rate)
-            self.recognizer.SetWords(True)
+            # Only the 'text' field is used, so skip per-word timing output;
+            # final results then stay a small {"text": ...} object
+            self.recognizer.SetWords(False)
             
             print(f"✅ Model loaded successfully!")
             return True
@@ -144,20 +382,71 @@ class RealtimeSTT:
             print(f"❌ Error loading model: {e}")
             return False
             
-    def audio_callback(self, indata, frames, time, status):
-        """Callback function for audio input"""
-        if status:
-            print(f"Audio status: {status}")
+    def make_audio_callback(self):
+        """Build the callback function for audio input
+
+        Everything the callback uses is resolved once here and captured as a
+        closure variable, so the real-time path does no attribute or global
+        lookups. Build a new callback after changing audio_gain.
+        """
+        acquire = self.audio_queue.acquire
+        commit = self.audio_queue.commit
+        frombuffer = np.frombuffer
+        int16 = np.int16
+
+        # Gain as Q8 fixed point, so amplification is integer-only
+        gain_q8 = round(self.audio_gain * 256)
+
+        if NUMBA_AVAILABLE:
+            apply_gain = _apply_gain_i16
+
+            # Compile (or load from cache) the kernel now: the first call
+            # would otherwise happen inside the real-time callback and take
+            # long enough to overflow the input stream
+            silence = np.zeros(self.block_size, dtype=int16)
+            apply_gain(silence, gain_q8, np.empty_like(silence))
 
-        # Convert to numpy array first
-        audio_array = np.frombuffer(indata, dtype=np.float32).copy()
+            def audio_callback(indata, frames, time, status):
+                """Callback function for audio input"""
+                if status:
+                    print(f"Audio status: {status}")
 
-        # Amplify and clip to prevent overflow
-        amplified = np.clip(audio_array * self.audio_gain, -1.0, 1.0)
+                # Claim a preallocated frame; drop the block if the consumer is behind
+                frame = acquire()
+                if frame is None:
+                    return
 
-        # Convert to int16 and then to bytes
-        audio_data = (amplified * 32767).astype('int16').tobytes()
-        self.audio_queue.put(audio_data)
+                # Saturating int16 gain in one compiled loop, straight from
+                # the PortAudio buffer into the frame
+                apply_gain(frombuffer(indata, dtype=int16), gain_q8, frame[:frames])
+                commit()
+
+            return audio_callback
+
+        i32_scratch = self._i32_scratch
+        multiply, add, right_shift, clip, copyto = np.multiply, np.add, np.right_shift, np.clip, np.copyto
+        int32 = np.int32
+
+        def audio_callback(indata, frames, time, status):
+            """Callback function for audio input"""
+            if status:
+                print(f"Audio status: {status}")
+
+            # Claim a preallocated frame; drop the block if the consumer is behind
+            frame = acquire()
+            if frame is None:
+                return
+
+            # Amplify (rounding) and clip to the int16 range to prevent overflow
+            i32 = i32_scratch[:frames]
+            multiply(frombuffer(indata, dtype=int16), gain_q8, out=i32, dtype=int32)
+            add(i32, 128, out=i32)
+            right_shift(i32, 8, out=i32)
+            clip(i32, -32768, 32767, out=i32)
+            copyto(frame[:frames], i32, casting='unsafe')
+            commit()
+
+        return audio_callback
         
     def process_audio(self):
         """Process audio data from the queue and perform recognition"""
@@ -167,37 +456,55 @@ class RealtimeSTT:
         print("-" * 60)
 
         last_partial = ""
+        last_partial_raw = ""
         audio_count = 0
+        next_display = 10
 
         while self.is_running:
             try:
-                # Get audio data from queue
-                data = self.audio_queue.get(timeout=1)
-                audio_count += 1
+                # Get all audio data waiting in the ring, so a backlog is fed
+                # to Vosk in a single call
+                frames = self.audio_queue.get(timeout=0.1)
+                audio_count += len(frames)
 
                 # Show audio activity every 10 chunks
-                if audio_count % 10 == 0:
-                    # Convert back to float to check levels
-                    audio_array = np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32767.0
-                    volume = np.sqrt(np.mean(audio_array**2))
-
-                    # Show volume bar
-                    bar_length = 20
-                    filled_length = int(bar_length * min(volume * 50, 1.0))  # Scale up for visibility
-                    bar = '█' * filled_length + '-' * (bar_length - filled_length)
-                    print(f"\rAudio: |{bar}| {volume:.3f}", end='', flush=True)
-
-                # Process with recognizer
-                if self.recognizer.AcceptWaveform(data):
+                if audio_count >= next_display:
+                    next_display = audio_count + 10
+
+                    # Level is computed here rather than on the audio thread
+                    audio_array = self._level_scratch
+                    np.copyto(audio_array, frames[-1])
+                    sum_squares = float(np.dot(audio_array, audio_array))
+                    self._latest_volume = math.sqrt(sum_squares / audio_array.size) / 32767.0
+                    self._volume_updates += 1
+
+                # Process with recognizer, reading the frames in place when
+                # possible; the slots go back to the ring once Vosk is done
+                try:
+                    if _vosk_ffi is not None:
+                        data = _vosk_ffi.from_buffer(frames)
+                    else:
+                        data = frames.tobytes()
+                    accepted = self.recognizer.AcceptWaveform(data)
+                finally:
+                    self.audio_queue.release(len(frames))
+
+                if accepted:
                     # Final result
-                    result = json.loads(self.recognizer.Result())
+                    result = _json_loads(self.recognizer.Result())
                     text = result.get('text', '').strip()
                     if text:
                         print(f"\n✅ Final: {text}")
                         last_partial = ""
+                    last_partial_raw = ""
                 else:
-                    # Partial result
-                    partial = json.loads(self.recognizer.PartialResult())
+                    # Partial result; skip parsing when Vosk repeats itself
+                    partial_raw = self.recognizer.PartialResult()
+                    if partial_raw == last_partial_raw:
+                        continue
+                    last_partial_raw = partial_raw
+
+                    partial = _json_loads(partial_raw)
                     partial_text = partial.get('partial', '').strip()
                     if partial_text and partial_text != last_partial:
                         print(f"\n... {partial_text}", end='', flush=True)
@@ -208,6 +515,30 @@ class RealtimeSTT:
             except Exception as e:
                 print(f"\n❌ Error processing audio: {e}")
                 
+    def display_levels(self):
+        """Show the latest audio level, on its own thread so slow terminals never stall recognition"""
+        # Write pre-encoded lines straight to the byte stream when there is one
+        out = getattr(sys.stdout, 'buffer', None)
+        encoding = sys.stdout.encoding or 'utf-8'
+        lines = [f"\rAudio: |{bar}| ".encode(encoding, errors='replace') for bar in self._bars]
+        shown_updates = 0
+
+        while self.is_running:
+            time.sleep(0.1)
+            if self._volume_updates == shown_updates:
+                continue
+            shown_updates = self._volume_updates
+            volume = self._latest_volume
+
+            # Show volume bar
+            filled_length = int(self.bar_length * min(volume * 50, 1.0))  # Scale up for visibility
+            if out is None:
+                print(f"\rAudio: |{self._bars[filled_length]}| {volume:.3f}", end='', flush=True)
+            else:
+                sys.stdout.flush()  # Keep ordering with text printed elsewhere
+                out.write(lines[filled_length] + b"%.3f" % volume)
+                out.flush()
+
     def start_transcription(self):
         """Start real-time audio transcription"""
         if not self.recognizer:
@@ -220,15 +551,19 @@ class RealtimeSTT:
             # Start audio processing thread
             audio_thread = threading.Thread(target=self.process_audio, daemon=True)
             audio_thread.start()
+
+            # Start volume display thread
+            display_thread = threading.Thread(target=self.display_levels, daemon=True)
+            display_thread.start()
             
             # Start audio stream
             with sd.RawInputStream(
                 samplerate=self.sample_rate,
                 blocksize=self.block_size,
                 device=None,  # Use default device
-                dtype='float32',
+                dtype='int16',
                 channels=1,
-                callback=self.audio_callback
+                callback=self.make_audio_callback()
             ):
                 print(f"🎤 Listening... (Sample rate: {self.sample_rate} Hz)")
                 
@@ -251,6 +586,11 @@ class RealtimeSTT:
         try:
             # Display welcome message
             self.display_welcome()
+
+            # Load the default model and warm the others' files while
+            # waiting for the language choice
+            self.start_prefetch()
+            self.start_cache_warmup()
             
             # Language selection
             if not self.select_language():
@@ -259,6 +599,10 @@ class RealtimeSTT:
             # Load model
             if not self.load_model():
                 return
+
+            # Keep the other models in RAM for quick language switches
+            if self.pin_models:
+                threading.Thread(target=self.pin_other_models, daemon=True).start()
                 
             # Start transcription
             self.start_transcription()
@@ -8,9 +8,74 @@ import os
 import sys
 import json
 import time
+import atexit
+import queue
+import signal
 import psutil
+from collections import deque
 from datetime import datetime, timedelta
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster encoder/decoder for the metrics file
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+# Number of samples kept per resource history
+RESOURCE_HISTORY_SIZE = 100
+
+# Number of errors kept in the error log (oldest are evicted first)
+ERROR_LOG_SIZE = 500
+
+# Parallel series making up the resource history; "ts" is shared by all
+RESOURCE_SERIES = (
+    "ts", "cpu", "process_cpu", "memory", "memory_available_gb", "disk", "disk_free_gb"
+)
+
+# Metrics are persisted as one small file per section so a save only
+# rewrites the sections that changed
+METRIC_SECTIONS = {
+    "counters": (
+        "session_start", "total_queries", "successful_responses",
+        "failed_responses", "average_response_time"
+    ),
+    "health": ("component_health",),
+    "resources": ("system_resources",),
+    "errors": ("error_log",)
+}
+
+# Query outcome markers for the log
+_OK = "✅"
+_FAIL = "❌"
+
+# ANSI escape: clear the screen and move the cursor home
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+
+# ANSI escapes to redraw the uptime line in place: save the cursor, jump to
+# the uptime row (the dashboard's fifth line) and clear it, then restore
+UPTIME_LINE_START = "\x1b7\x1b[5;1H\x1b[2K"
+UPTIME_LINE_END = "\x1b8"
+
+US_PER_HOUR = 3_600_000_000
+US_PER_DAY = 86_400_000_000
+
+
+def _dump_json(obj):
+    """Serialize to compact UTF-8 JSON bytes (deques are written as arrays)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=list)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=list).encode('utf-8')
+
+
+_load_json = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _now_us():
+    """Current time as integer epoch microseconds (stored as "ts")"""
+    return time.time_ns() // 1000
 
 
 class SystemMonitor:
@@ -19,8 +84,11 @@ class SystemMonitor:
     def __init__(self):
         """Initialize system monitor"""
         self.start_time = datetime.now()
+        self._start_us = _now_us()
         self.log_file = "farmer_assistant.log"
-        self.metrics_file = "system_metrics.json"
+        self.metrics_files = {
+            section: f"system_metrics_{section}.json" for section in METRIC_SECTIONS
+        }
         
         # Setup logging
         self.setup_logging()
@@ -39,25 +107,68 @@ class SystemMonitor:
                 "tts": "unknown"
             },
             "system_resources": {
-                "cpu_usage": [],
-                "memory_usage": [],
-                "disk_usage": []
+                series: deque(maxlen=RESOURCE_HISTORY_SIZE) for series in RESOURCE_SERIES
             },
-            "error_log": []
+            "error_log": deque(maxlen=ERROR_LOG_SIZE)
         }
         
+        # Number of components whose status is "healthy", kept up to date by
+        # set_component_status so the report need not recount
+        self._healthy_count = 0
+        
+        # Errors are appended in time order, so the ones from the last hour
+        # are a suffix of error_log (which may also have evicted old entries
+        # from the left). Track the number of errors ever logged
+        # and the position (counted the same way) where that suffix starts
+        self._errors_logged = 0
+        self._recent_error_index = 0
+        
+        # psutil handles, primed so non-blocking cpu_percent() calls return
+        # the usage since the previous sample
+        self._process = psutil.Process(os.getpid())
+        self._process.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None)
+        
+        # Disk usage barely changes, so it is only re-read every few samples
+        self.disk_sample_every = 12
+        self._disk_samples = 0
+        self._disk = None
+        
+        # Metrics are written to disk periodically, not on every event
+        self.flush_interval = 5.0
+        self._dirty_sections = set()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+        
+        # Values shown on the last full dashboard render
+        self._dashboard_key = None
+        
         self.logger.info("System monitor initialized")
     
     def setup_logging(self):
-        """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        """Setup logging configuration
+
+        Callers only enqueue log records; a QueueListener thread formats them
+        and does the file and console writes. The log file rotates at 8 MB,
+        keeping four backups.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = RotatingFileHandler(
+            self.log_file, maxBytes=8 * 1024 * 1024, backupCount=4, encoding='utf-8'
         )
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+        
+        # The queued record only carries the message; the listener's
+        # handlers add the timestamp and level
+        self._log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(self._log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        self._log_listener = QueueListener(self._log_queue, file_handler, stream_handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
         self.logger = logging.getLogger(__name__)
     
     def log_query(self, query: str, intent: str, confidence: float, response_time: float, success: bool):
@@ -69,17 +180,16 @@ class SystemMonitor:
         else:
             self.metrics["failed_responses"] += 1
         
-        # Update average response time
-        total_responses = self.metrics["successful_responses"] + self.metrics["failed_responses"]
-        if total_responses > 0:
-            current_avg = self.metrics["average_response_time"]
-            self.metrics["average_response_time"] = (
-                (current_avg * (total_responses - 1) + response_time) / total_responses
-            )
+        # Update average response time incrementally (every query is either
+        # a success or a failure, so total_queries counts the responses)
+        current_avg = self.metrics["average_response_time"]
+        self.metrics["average_response_time"] = (
+            current_avg + (response_time - current_avg) / self.metrics["total_queries"]
+        )
         
         # Log details
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts": _now_us(),
             "query": query[:100],  # Truncate for privacy
             "intent": intent,
             "confidence": confidence,
@@ -87,70 +197,73 @@ class SystemMonitor:
             "success": success
         }
         
-        self.logger.info(f"Query processed: {intent} ({confidence:.2f}) - {response_time:.2f}s - {'✅' if success else '❌'}")
+        self.logger.info("Query processed: %s (%.2f) - %.2fs - %s",
+                         intent, confidence, response_time, _OK if success else _FAIL)
         
-        # Save metrics
-        self.save_metrics()
+        self.mark_dirty("counters")
+        self.maybe_flush()
     
     def log_error(self, component: str, error: str):
         """Log system error"""
         error_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "ts": _now_us(),
             "component": component,
             "error": str(error)
         }
         
         self.metrics["error_log"].append(error_entry)
-        self.metrics["component_health"][component] = "error"
+        self._errors_logged += 1
+        self.set_component_status(component, "error")
         
-        self.logger.error(f"{component} error: {error}")
-        self.save_metrics()
+        self.logger.error("%s error: %s", component, error)
+        self.mark_dirty("errors", "health")
+        self.maybe_flush()
+    
+    def set_component_status(self, component: str, status: str):
+        """Store a component's status and adjust the healthy-component count"""
+        component_health = self.metrics["component_health"]
+        was_healthy = component_health.get(component) == "healthy"
+        component_health[component] = status
+        self._healthy_count += (status == "healthy") - was_healthy
     
     def update_component_health(self, component: str, status: str):
         """Update component health status"""
-        self.metrics["component_health"][component] = status
-        self.logger.info(f"{component} status: {status}")
-        self.save_metrics()
+        self.set_component_status(component, status)
+        self.logger.info("%s status: %s", component, status)
+        self.mark_dirty("health")
     
     def monitor_system_resources(self):
         """Monitor system resource usage"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            self.metrics["system_resources"]["cpu_usage"].append({
-                "timestamp": datetime.now().isoformat(),
-                "value": cpu_percent
-            })
+            resources = self.metrics["system_resources"]
+            resources["ts"].append(_now_us())
+            
+            # CPU usage since the previous sample (system-wide and this process)
+            resources["cpu"].append(psutil.cpu_percent(interval=None))
+            resources["process_cpu"].append(self._process.cpu_percent(interval=None))
             
             # Memory usage
             memory = psutil.virtual_memory()
-            self.metrics["system_resources"]["memory_usage"].append({
-                "timestamp": datetime.now().isoformat(),
-                "value": memory.percent,
-                "available_gb": memory.available / (1024**3)
-            })
+            resources["memory"].append(memory.percent)
+            resources["memory_available_gb"].append(memory.available / (1024**3))
             
             # Disk usage
-            disk = psutil.disk_usage('/')
-            self.metrics["system_resources"]["disk_usage"].append({
-                "timestamp": datetime.now().isoformat(),
-                "value": (disk.used / disk.total) * 100,
-                "free_gb": disk.free / (1024**3)
-            })
-            
-            # Keep only last 100 entries
-            for resource in self.metrics["system_resources"]:
-                if len(self.metrics["system_resources"][resource]) > 100:
-                    self.metrics["system_resources"][resource] = self.metrics["system_resources"][resource][-100:]
+            if self._disk_samples % self.disk_sample_every == 0:
+                self._disk = psutil.disk_usage('/')
+            self._disk_samples += 1
+            disk = self._disk
+            resources["disk"].append((disk.used / disk.total) * 100)
+            resources["disk_free_gb"].append(disk.free / (1024**3))
             
-            self.save_metrics()
+            self.mark_dirty("resources")
             
         except Exception as e:
             self.log_error("system_monitor", f"Resource monitoring failed: {e}")
     
     def get_system_health_report(self):
         """Generate system health report"""
-        uptime = datetime.now() - self.start_time
+        now_us = _now_us()
+        uptime = timedelta(microseconds=now_us - self._start_us)
         
         # Calculate success rate
         total_queries = self.metrics["total_queries"]
@@ -163,21 +276,23 @@ class SystemMonitor:
         latest_memory = 0
         latest_disk = 0
         
-        if self.metrics["system_resources"]["cpu_usage"]:
-            latest_cpu = self.metrics["system_resources"]["cpu_usage"][-1]["value"]
-        
-        if self.metrics["system_resources"]["memory_usage"]:
-            latest_memory = self.metrics["system_resources"]["memory_usage"][-1]["value"]
-            
-        if self.metrics["system_resources"]["disk_usage"]:
-            latest_disk = self.metrics["system_resources"]["disk_usage"][-1]["value"]
+        resources = self.metrics["system_resources"]
+        if resources["ts"]:
+            latest_cpu = resources["cpu"][-1]
+            latest_memory = resources["memory"][-1]
+            latest_disk = resources["disk"][-1]
         
-        # Component health summary
-        healthy_components = sum(1 for status in self.metrics["component_health"].values() if status == "healthy")
-        total_components = len(self.metrics["component_health"])
+        # Advance the recent-errors window start past errors older than an hour
+        error_log = self.metrics["error_log"]
+        first_index = self._errors_logged - len(error_log)
+        cutoff_us = now_us - US_PER_HOUR
+        index = max(self._recent_error_index, first_index)
+        while index < self._errors_logged and error_log[index - first_index]["ts"] <= cutoff_us:
+            index += 1
+        self._recent_error_index = index
         
         report = {
-            "system_status": "healthy" if success_rate > 80 and healthy_components >= 3 else "warning",
+            "system_status": "healthy" if success_rate > 80 and self._healthy_count >= 3 else "warning",
             "uptime": str(uptime),
             "total_queries": total_queries,
             "success_rate": success_rate,
@@ -188,87 +303,160 @@ class SystemMonitor:
                 "memory_percent": latest_memory,
                 "disk_percent": latest_disk
             },
-            "recent_errors": len([e for e in self.metrics["error_log"] 
-                                if datetime.fromisoformat(e["timestamp"]) > datetime.now() - timedelta(hours=1)])
+            "recent_errors": self._errors_logged - index
         }
         
         return report
     
     def display_health_dashboard(self):
-        """Display real-time health dashboard"""
+        """Display real-time health dashboard; returns True if fully redrawn"""
         report = self.get_system_health_report()
+        resources = report["resource_usage"]
         
-        print("\n🔍 Farmer Assistant - System Health Dashboard")
-        print("=" * 60)
+        # Only redraw everything when a visible value changed; otherwise just
+        # refresh the uptime line in place
+        key = (
+            report["total_queries"],
+            round(resources["cpu_percent"]),
+            round(resources["memory_percent"]),
+            round(resources["disk_percent"]),
+            report["system_status"],
+            report["recent_errors"],
+            tuple(report["component_health"].values())
+        )
+        if key == self._dashboard_key:
+            sys.stdout.write(f"{UPTIME_LINE_START}⏱️ Uptime: {report['uptime']}{UPTIME_LINE_END}")
+            sys.stdout.flush()
+            return False
+        self._dashboard_key = key
         
         # System status
         status_icon = "🟢" if report["system_status"] == "healthy" else "🟡"
-        print(f"{status_icon} System Status: {report['system_status'].upper()}")
-        print(f"⏱️ Uptime: {report['uptime']}")
-        
-        # Performance metrics
-        print(f"\n📊 Performance Metrics:")
-        print(f"  💬 Total Queries: {report['total_queries']}")
-        print(f"  ✅ Success Rate: {report['success_rate']:.1f}%")
-        print(f"  ⚡ Avg Response Time: {report['average_response_time']:.2f}s")
-        
-        # Component health
-        print(f"\n🔧 Component Health:")
+        lines = [
+            CLEAR_SCREEN + "\n🔍 Farmer Assistant - System Health Dashboard",
+            "=" * 60,
+            f"{status_icon} System Status: {report['system_status'].upper()}",
+            f"⏱️ Uptime: {report['uptime']}",
+            
+            # Performance metrics
+            "\n📊 Performance Metrics:",
+            f"  💬 Total Queries: {report['total_queries']}",
+            f"  ✅ Success Rate: {report['success_rate']:.1f}%",
+            f"  ⚡ Avg Response Time: {report['average_response_time']:.2f}s",
+            
+            # Component health
+            "\n🔧 Component Health:"
+        ]
         for component, status in report["component_health"].items():
             icon = "✅" if status == "healthy" else "❌" if status == "error" else "⚪"
-            print(f"  {icon} {component.upper()}: {status}")
+            lines.append(f"  {icon} {component.upper()}: {status}")
         
         # Resource usage
-        print(f"\n💻 Resource Usage:")
-        print(f"  🖥️ CPU: {report['resource_usage']['cpu_percent']:.1f}%")
-        print(f"  🧠 Memory: {report['resource_usage']['memory_percent']:.1f}%")
-        print(f"  💾 Disk: {report['resource_usage']['disk_percent']:.1f}%")
+        lines += [
+            "\n💻 Resource Usage:",
+            f"  🖥️ CPU: {resources['cpu_percent']:.1f}%",
+            f"  🧠 Memory: {resources['memory_percent']:.1f}%",
+            f"  💾 Disk: {resources['disk_percent']:.1f}%"
+        ]
         
         # Recent errors
         if report["recent_errors"] > 0:
-            print(f"\n⚠️ Recent Errors (last hour): {report['recent_errors']}")
+            lines.append(f"\n⚠️ Recent Errors (last hour): {report['recent_errors']}")
+        
+        lines += ["=" * 60, "\n💡 Press Ctrl+C to exit monitoring"]
         
-        print("=" * 60)
+        # Emit the whole dashboard with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+        return True
+    
+    def mark_dirty(self, *sections):
+        """Record which metric sections changed since the last save"""
+        self._dirty_sections.update(sections)
+    
+    def maybe_flush(self, min_interval=None):
+        """Save metrics if they changed and the flush interval has elapsed"""
+        if min_interval is None:
+            min_interval = self.flush_interval
+        if self._dirty_sections and time.monotonic() - self._last_flush >= min_interval:
+            self.save_metrics()
+    
+    def flush(self):
+        """Save metrics now if they changed (used at shutdown)"""
+        if self._dirty_sections:
+            self.save_metrics()
     
-    def save_metrics(self):
-        """Save metrics to file"""
+    def save_metrics(self, sections=None):
+        """Save metric sections to their files (the changed ones by default)"""
+        if sections is None:
+            sections = tuple(self._dirty_sections)
+        self._dirty_sections.difference_update(sections)
+        self._last_flush = time.monotonic()
         try:
-            with open(self.metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(self.metrics, f, indent=2, ensure_ascii=False)
+            for section in sections:
+                # Serialize compactly in one go (resource histories are deques,
+                # written as JSON arrays) and hand the file a single write.
+                # Writing a temp file and renaming it over the old one means an
+                # interrupted save never leaves a truncated metrics file
+                payload = _dump_json({key: self.metrics[key] for key in METRIC_SECTIONS[section]})
+                metrics_file = self.metrics_files[section]
+                tmp_file = metrics_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_file, metrics_file)
         except Exception as e:
-            self.logger.error(f"Failed to save metrics: {e}")
+            self.logger.error("Failed to save metrics: %s", e)
     
     def load_metrics(self):
-        """Load metrics from file"""
+        """Load metrics from the per-section files"""
         try:
-            if os.path.exists(self.metrics_file):
-                with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                    saved_metrics = json.load(f)
-                    # Merge with current metrics
-                    self.metrics.update(saved_metrics)
-                    self.logger.info("Metrics loaded from file")
+            saved_metrics = {}
+            for metrics_file in self.metrics_files.values():
+                if os.path.exists(metrics_file):
+                    with open(metrics_file, 'rb') as f:
+                        saved_metrics.update(_load_json(f.read()))
+            if saved_metrics:
+                # Rehydrate resource series into bounded deques; histories
+                # saved in an older layout are dropped
+                saved_resources = saved_metrics.pop("system_resources", {})
+                if all(series in saved_resources for series in RESOURCE_SERIES):
+                    self.metrics["system_resources"] = {
+                        series: deque(saved_resources[series], maxlen=RESOURCE_HISTORY_SIZE)
+                        for series in RESOURCE_SERIES
+                    }
+                if "error_log" in saved_metrics:
+                    saved_metrics["error_log"] = deque(
+                        (error for error in saved_metrics["error_log"] if "ts" in error),
+                        maxlen=ERROR_LOG_SIZE
+                    )
+                # Merge with current metrics
+                self.metrics.update(saved_metrics)
+                self._errors_logged = len(self.metrics["error_log"])
+                self._recent_error_index = 0
+                self._healthy_count = sum(
+                    1 for status in self.metrics["component_health"].values() if status == "healthy"
+                )
+                self.logger.info("Metrics loaded from file")
         except Exception as e:
-            self.logger.error(f"Failed to load metrics: {e}")
+            self.logger.error("Failed to load metrics: %s", e)
     
     def cleanup_old_logs(self, days=7):
         """Clean up old log entries"""
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff_us = _now_us() - days * US_PER_DAY
         
-        # Clean error log
-        self.metrics["error_log"] = [
-            error for error in self.metrics["error_log"]
-            if datetime.fromisoformat(error["timestamp"]) > cutoff_date
-        ]
+        # Entries are appended in time order, so expired ones are at the left
+        error_log = self.metrics["error_log"]
+        while error_log and error_log[0]["ts"] <= cutoff_us:
+            error_log.popleft()
         
-        # Clean resource usage logs
-        for resource in self.metrics["system_resources"]:
-            self.metrics["system_resources"][resource] = [
-                entry for entry in self.metrics["system_resources"][resource]
-                if datetime.fromisoformat(entry["timestamp"]) > cutoff_date
-            ]
+        resources = self.metrics["system_resources"]
+        timestamps = resources["ts"]
+        while timestamps and timestamps[0] <= cutoff_us:
+            for series in resources.values():
+                series.popleft()
         
-        self.save_metrics()
-        self.logger.info(f"Cleaned up logs older than {days} days")
+        self.mark_dirty("errors", "resources")
+        self.logger.info("Cleaned up logs older than %s days", days)
 
 
 # Global monitor instance
@@ -279,23 +467,36 @@ def main():
     """Main monitoring function"""
     print("🔍 System Monitor - Real-time Dashboard")
     
+    # Exit normally on SIGTERM so the atexit flush still saves metrics
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    # An empty command makes the Windows 10+ console honour ANSI escapes
+    if os.name == 'nt':
+        os.system('')
+    
     try:
         monitor.load_metrics()
         
+        # Ticks are scheduled on the monotonic clock, so the time spent
+        # sampling and drawing does not stretch the 5 second period
+        refresh_interval = 5.0
+        next_tick = time.monotonic()
+        
         while True:
-            # Clear screen
-            os.system('cls' if os.name == 'nt' else 'clear')
-            
             # Update resource monitoring
             monitor.monitor_system_resources()
             
-            # Display dashboard
+            # Display dashboard (skipped when nothing visible changed)
             monitor.display_health_dashboard()
             
-            print("\n💡 Press Ctrl+C to exit monitoring")
+            # Persist metrics if they changed
+            monitor.maybe_flush()
             
-            # Wait 5 seconds
-            time.sleep(5)
+            # Wait for the next tick
+            next_tick += refresh_interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
             
     except KeyboardInterrupt:
         print("\n👋 Monitoring stopped")
@@ -6,6 +6,40 @@ Quick test to check if API is working
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster JSON encoding/decoding
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+
+def dump_json(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def load_json(data: bytes):
+    """Parse JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pretty_json(obj) -> str:
+    """Indented JSON for display (Devanagari left unescaped)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# One session for all test calls so the connection to the server is reused
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 def test_api():
     """Test the API"""
@@ -22,14 +56,16 @@ def test_api():
         print(f"📤 Sending request to: {url}")
         print(f"📝 Query: {test_query}")
         
-        response = requests.post(url, json=payload, timeout=30)
+        response = SESSION.post(
+            url, data=dump_json(payload), headers={"Content-Type": "application/json"}, timeout=30
+        )
         
         print(f"📡 Response status: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = load_json(response.content)
             print("✅ API Response received:")
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+            print(pretty_json(result))
             
             if result.get("success"):
                 print("🎉 API is working correctly!")
@@ -52,12 +88,12 @@ def test_stats():
     
     try:
         url = "http://localhost:5000/api/stats"
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=10)
         
         if response.status_code == 200:
-            stats = response.json()
+            stats = load_json(response.content)
             print("✅ Stats received:")
-            print(json.dumps(stats, indent=2, ensure_ascii=False))
+            print(pretty_json(stats))
             return True
         else:
             print(f"❌ Stats error: {response.status_code}")
@@ -71,11 +107,12 @@ if __name__ == "__main__":
     print("🌾 Farmer Assistant API Test")
     print("=" * 50)
     
-    # Test main API
-    api_success = test_api()
-    
-    # Test stats
-    stats_success = test_stats()
+    # Run the main API and stats tests concurrently (their output may interleave)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(test_api)
+        stats_future = executor.submit(test_stats)
+        api_success = api_future.result()
+        stats_success = stats_future.result()
     
     print("\n" + "=" * 50)
     if api_success and stats_success:
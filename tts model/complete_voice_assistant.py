@@ -6,9 +6,89 @@ Full voice-to-voice farmer assistant pipeline
 
 import os
 import sys
+import json
 import time
+import queue
+import pickle
+import asyncio
+import hashlib
 import threading
+from pathlib import Path
 from datetime import datetime
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+import httpx
+import numpy as np
+
+from tts_common import split_sentences, iter_sse_sentences
+
+HTTP2_AVAILABLE = False
+ORJSON_AVAILABLE = False
+SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  Lets httpx speak HTTP/2 to the LLM API
+    HTTP2_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    import orjson  # Optional faster JSON for Groq requests and stream chunks
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    from sentence_transformers import SentenceTransformer  # Optional semantic cache tier
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    pass
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+# llm/.env is parsed on the first setup_llm call only
+_ENV_LOADED = False
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Fixed replies for greetings, thanks and help requests; these are answered
+# without calling the LLM, and their speech is pre-synthesized
+TRIVIAL_REPLIES = {
+    "नमस्ते": "नमस्कार किसान भाई, खेती से जुड़ा अपना सवाल पूछिए।",
+    "नमस्कार": "नमस्कार किसान भाई, खेती से जुड़ा अपना सवाल पूछिए।",
+    "hello": "नमस्कार किसान भाई, खेती से जुड़ा अपना सवाल पूछिए।",
+    "धन्यवाद": "आपका स्वागत है। खेती में सफलता की शुभकामनाएं!",
+    "शुक्रिया": "आपका स्वागत है। खेती में सफलता की शुभकामनाएं!",
+    "thanks": "आपका स्वागत है। खेती में सफलता की शुभकामनाएं!",
+    "thank you": "आपका स्वागत है। खेती में सफलता की शुभकामनाएं!",
+    "मदद": "आप बीज, खाद, कीटनाशक, फसल रोग, मंडी भाव या सरकारी योजनाओं के बारे में पूछ सकते हैं।",
+    "help": "आप बीज, खाद, कीटनाशक, फसल रोग, मंडी भाव या सरकारी योजनाओं के बारे में पूछ सकते हैं।"
+}
+
+# Enhanced farmer-specific system prompt for voice
+SYSTEM_PROMPT = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
+
+आपकी विशेषताएं:
+- बीज, खाद, कीटनाशक की सलाह
+- फसल रोग की पहचान और इलाज  
+- मंडी भाव और बिक्री की सलाह
+- मौसम के अनुसार खेती की सलाह
+- सरकारी योजनाओं की जानकारी
+
+जवाब हमेशा:
+- हिंदी में दें
+- 2-3 वाक्यों में संक्षिप्त हो (voice के लिए)
+- तुरंत लागू होने वाला हो
+- व्यावहारिक और उपयोगी हो
+- बोलने के लिए उपयुक्त हो (TTS के लिए)
+- सरल शब्दों में हो"""
 
 # Add parent directories to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,18 +100,130 @@ nlp_dir = os.path.join(parent_dir, 'nlp')
 llm_dir = os.path.join(parent_dir, 'llm')
 
 sys.path.append(stt_dir)
-sys.path.append(nlm_dir)
+sys.path.append(nlp_dir)
 sys.path.append(llm_dir)
 
 # Import all systems
 try:
-    from farmer_tts import FarmerTTS
+    from farmer_tts import FarmerTTS, INTRO_TEXT
     print("✅ TTS module imported")
 except ImportError as e:
     print(f"❌ Could not import TTS module: {e}")
     sys.exit(1)
 
 
+class LLMCache:
+    """Two-tier cache of LLM responses: exact query match, then semantic match"""
+    
+    def __init__(self, cache_file, maxsize=512, threshold=0.92,
+                 model_name='paraphrase-multilingual-MiniLM-L12-v2'):
+        """Initialize the cache and load any saved entries"""
+        self.cache_file = Path(cache_file)
+        self.maxsize = maxsize
+        self.threshold = threshold
+        
+        # Exact tier: normalized query hash -> response, in LRU order
+        self.exact = OrderedDict()
+        
+        # Semantic tier: unit-length query embeddings with parallel responses
+        self.embeds = np.empty((0, 384), dtype=np.float32)
+        self.responses = []
+        
+        # get and put run on worker threads (encoding blocks for tens of
+        # milliseconds), so both tiers are updated under a lock
+        self.lock = threading.Lock()
+        
+        self.load()
+        
+        # The embedding model takes seconds to load, so it loads in the
+        # background and the semantic tier is used once it is ready
+        self.encoder = None
+        if SENTENCE_TRANSFORMERS_AVAILABLE:
+            threading.Thread(target=self.load_encoder, args=(model_name,), daemon=True).start()
+    
+    def load_encoder(self, model_name):
+        """Load the sentence embedding model"""
+        try:
+            self.encoder = SentenceTransformer(model_name)
+        except Exception as e:
+            print(f"⚠️ Semantic cache unavailable: {e}")
+    
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercase, trim and collapse whitespace"""
+        return " ".join(query.lower().split())
+    
+    def key(self, query: str) -> str:
+        """Exact-tier key for a query"""
+        return hashlib.sha256(self.normalize(query).encode('utf-8')).hexdigest()
+    
+    def embed(self, query: str):
+        """Unit-length embedding of the normalized query (None if unavailable)"""
+        if self.encoder is None:
+            return None
+        return self.encoder.encode(
+            self.normalize(query), convert_to_numpy=True, normalize_embeddings=True
+        ).astype(np.float32)
+    
+    def get(self, query: str):
+        """Return a cached response for query, or None"""
+        key = self.key(query)
+        with self.lock:
+            if key in self.exact:
+                self.exact.move_to_end(key)
+                return self.exact[key]
+            embeds, responses = self.embeds, self.responses
+        
+        if len(responses):
+            q = self.embed(query)
+            if q is not None:
+                # Embeddings are unit length, so the dot product is the cosine
+                similarities = embeds @ q
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    return responses[best]
+        return None
+    
+    def put(self, query: str, response: str):
+        """Store a response in both tiers"""
+        key = self.key(query)
+        q = self.embed(query)
+        with self.lock:
+            self.exact[key] = response
+            self.exact.move_to_end(key)
+            if len(self.exact) > self.maxsize:
+                self.exact.popitem(last=False)
+            
+            if q is not None:
+                self.embeds = np.vstack((self.embeds[-(self.maxsize - 1):], q[None, :]))
+                self.responses = self.responses[-(self.maxsize - 1):] + [response]
+    
+    def save(self):
+        """Persist the cache to disk"""
+        try:
+            with self.lock, open(self.cache_file, 'wb') as f:
+                pickle.dump({
+                    "exact": self.exact,
+                    "embeds": self.embeds,
+                    "responses": self.responses
+                }, f)
+        except Exception as e:
+            print(f"⚠️ Could not save LLM cache: {e}")
+    
+    def load(self):
+        """Load a previously saved cache"""
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, 'rb') as f:
+                saved = pickle.load(f)
+            self.exact = saved["exact"]
+            self.embeds = saved["embeds"]
+            self.responses = saved["responses"]
+        except Exception as e:
+            print(f"⚠️ Could not load LLM cache: {e}")
+
+
 class CompleteVoiceAssistant:
     """Complete voice-to-voice farmer assistant"""
     
@@ -65,89 +257,149 @@ class CompleteVoiceAssistant:
             sys.exit(1)
         print("✅ TTS system ready")
         
+        # Sentences are spoken by a worker thread as they stream in from the LLM
+        self.speech_queue = queue.Queue()
+        threading.Thread(target=self.speech_worker, daemon=True).start()
+        
+        # Have the fixed replies' audio ready before anyone asks
+        if self.tts.current_engine == "gtts":
+            threading.Thread(
+                target=self.tts.prewarm_cache, args=(set(TRIVIAL_REPLIES.values()),), daemon=True
+            ).start()
+        
         # 2. Initialize LLM (simple version)
         print("🤖 Initializing LLM system...")
         self.setup_llm()
         print("✅ LLM system ready")
         
+        # Do DNS and TLS handshakes now rather than on the first question
+        self.warm_up_connections()
+        
         # 3. STT will be initialized when needed
         self.stt = None
         print("⏳ STT will be initialized on demand")
     
     def setup_llm(self):
         """Setup LLM system"""
-        # Load environment variables
-        self.load_env()
+        # Load environment variables (once per process)
+        global _ENV_LOADED
+        if not _ENV_LOADED:
+            load_dotenv(os.path.join(parent_dir, 'llm', '.env'), override=False)
+            _ENV_LOADED = True
         
-        # Check API key
+        # Check API key (the template's placeholder does not count)
         self.api_key = os.getenv('GROQ_API_KEY')
-        if not self.api_key:
+        if not self.api_key or self.api_key == "your_api_key_here":
             print("❌ No Groq API key found!")
             print("💡 Please add GROQ_API_KEY to .env file in llm folder")
             sys.exit(1)
+        
+        # Request headers are built once and the async HTTP client is kept for
+        # the whole run, so repeat queries reuse the open connection to Groq.
+        # The client is bound to one event loop, which runs in its own thread
+        # and drives every query (and the startup warm-up)
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            retries=2
+        )
+        self.client = httpx.AsyncClient(transport=transport, timeout=15.0)
+        self.loop = asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, name="llm-loop", daemon=True)
+        self.loop_thread.start()
+        
+        # Everything in the request body except the user's question is fixed,
+        # so it is serialized once around a placeholder and each request only
+        # encodes the question. Spoken answers are 2-3 sentences, so 80
+        # output tokens is enough
+        template = _json_dumps({
+            "model": "llama3-70b-8192",
+            "temperature": 0.7,
+            "max_tokens": 80,
+            "stream": True,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": "__QUERY__"}
+            ]
+        })
+        self.body_prefix, self.body_suffix = template.split(b'"__QUERY__"')
+        
+        # Answers to repeated (or, with embeddings, similar) questions are
+        # served from the cache without calling Groq
+        self.llm_cache = LLMCache(Path("~/.farmer_llm_cache.pkl").expanduser())
     
-    def load_env(self):
-        """Load environment variables from llm/.env"""
-        env_file = os.path.join(parent_dir, 'llm', '.env')
-        if os.path.exists(env_file):
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if '=' in line and not line.startswith('#'):
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        if value and value != "your_api_key_here":
-                            os.environ[key] = value
+    def run(self, coro):
+        """Run a coroutine on the LLM event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
     
-    def get_llm_response(self, user_query: str) -> dict:
-        """Get response from LLM"""
-        import requests
+    def warm_up_connections(self):
+        """Open the LLM and speech connections in the background (failures are ignored)"""
+        if self.tts.current_engine == "gtts":
+            threading.Thread(target=self.tts.warm_up_connection, daemon=True).start()
         
-        # Enhanced farmer-specific system prompt for voice
-        system_prompt = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
-
-आपकी विशेषताएं:
-- बीज, खाद, कीटनाशक की सलाह
-- फसल रोग की पहचान और इलाज  
-- मंडी भाव और बिक्री की सलाह
-- मौसम के अनुसार खेती की सलाह
-- सरकारी योजनाओं की जानकारी
-
-जवाब हमेशा:
-- हिंदी में दें
-- 2-3 वाक्यों में संक्षिप्त हो (voice के लिए)
-- तुरंत लागू होने वाला हो
-- व्यावहारिक और उपयोगी हो
-- बोलने के लिए उपयुक्त हो (TTS के लिए)
-- सरल शब्दों में हो"""
-
-        try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": "llama3-70b-8192",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_query}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 150,  # Shorter for voice
-                "stream": False
+        # Opened through the query client on its own event loop, so the
+        # connection stays in its pool for the first query; startup does
+        # not wait for it
+        async def head_groq():
+            try:
+                await self.client.head("https://api.groq.com", timeout=3.0)
+            except Exception:
+                pass
+        
+        self.groq_warm_up = asyncio.run_coroutine_threadsafe(head_groq(), self.loop)
+    
+    def speech_worker(self):
+        """Speak queued sentences in order, recording each result"""
+        while True:
+            text, results = self.speech_queue.get()
+            try:
+                # The fixed intro is not a response, so it stays out of the TTS stats
+                results.append(self.tts.speak_text(text, record=text != INTRO_TEXT))
+            except Exception as e:
+                print(f"❌ Speech worker error: {e}")
+                results.append(False)
+            finally:
+                self.speech_queue.task_done()
+    
+    async def get_llm_response(self, user_query: str, on_sentence=None) -> dict:
+        """Get response from LLM, streaming complete sentences to on_sentence"""
+        # Cache lookups may encode the query, so they stay off the event loop
+        cached = await asyncio.to_thread(self.llm_cache.get, user_query)
+        if cached is not None:
+            if on_sentence:
+                for sentence in split_sentences(cached):
+                    on_sentence(sentence)
+            return {
+                "success": True,
+                "response": cached,
+                "response_time": 0,
+                "provider": "cache"
             }
+        
+        try:
+            body = self.body_prefix + _json_dumps(user_query) + self.body_suffix
             
-            start_time = time.time()
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
-            response_time = time.time() - start_time
+            start_time = time.perf_counter()
+            async with self.client.stream(
+                "POST", GROQ_URL, content=body, headers=self.headers
+            ) as response:
+                if response.status_code == 200:
+                    # Hand off every finished sentence as soon as it arrives
+                    sentences = []
+                    async for sentence in iter_sse_sentences(response.aiter_lines()):
+                        sentences.append(sentence)
+                        if on_sentence:
+                            on_sentence(sentence)
+                    llm_response = " ".join(sentences)
+            response_time = time.perf_counter() - start_time
             
             if response.status_code == 200:
-                result = response.json()
-                llm_response = result["choices"][0]["message"]["content"].strip()
-                
+                if llm_response:
+                    await asyncio.to_thread(self.llm_cache.put, user_query, llm_response)
                 return {
                     "success": True,
                     "response": llm_response,
@@ -170,11 +422,16 @@ class CompleteVoiceAssistant:
                 "provider": "groq"
             }
     
-    def process_voice_query(self, transcribed_text: str) -> dict:
+    async def process_voice_query(self, transcribed_text: str) -> dict:
         """Complete voice pipeline: Text → LLM → TTS"""
         if not transcribed_text or len(transcribed_text.strip()) < 3:
             return {"success": False, "reason": "Empty or too short text"}
         
+        # Greetings, thanks and help requests get a fixed spoken reply
+        reply = TRIVIAL_REPLIES.get(" ".join(transcribed_text.lower().split()).strip("।?!. "))
+        if reply:
+            return await self.speak_fixed_reply(transcribed_text, reply)
+        
         if self.is_processing:
             return {"success": False, "reason": "Already processing"}
         
@@ -185,11 +442,23 @@ class CompleteVoiceAssistant:
             print(f"\n🎤 Voice Input: {transcribed_text}")
             print("🔄 Processing through voice pipeline...")
             
-            # Step 1: Get LLM response
+            # Step 1: Get LLM response, speaking each sentence as it arrives
+            # (after the cached intro) while the rest are generated
             print("  🤖 Step 1: Getting intelligent response...")
-            llm_result = self.get_llm_response(transcribed_text)
+            spoken = []
+            tts_start = None
+            
+            def speak_sentence(sentence):
+                nonlocal tts_start
+                if tts_start is None:
+                    tts_start = time.time()
+                    self.speech_queue.put((INTRO_TEXT, spoken))
+                self.speech_queue.put((sentence, spoken))
+            
+            llm_result = await self.get_llm_response(transcribed_text, on_sentence=speak_sentence)
             
             if not llm_result["success"]:
+                await asyncio.to_thread(self.speech_queue.join)
                 print(f"  ❌ LLM failed: {llm_result['response']}")
                 return {
                     "success": False,
@@ -201,14 +470,13 @@ class CompleteVoiceAssistant:
             
             print(f"  ✅ LLM response received ({llm_result['response_time']:.2f}s)")
             
-            # Step 2: Convert to speech
+            # Step 2: Wait for the remaining speech to finish
             print("  🔊 Step 2: Converting to voice...")
-            tts_start = time.time()
-            
-            # Speak with intro
-            intro_text = "किसान सहायक का जवाब: " + llm_result["response"]
-            tts_success = self.tts.speak_text(intro_text)
+            await asyncio.to_thread(self.speech_queue.join)
+            tts_success = bool(spoken) and all(spoken)
             
+            if tts_start is None:
+                tts_start = time.time()
             tts_time = time.time() - tts_start
             total_time = time.time() - start_time
             
@@ -240,6 +508,34 @@ class CompleteVoiceAssistant:
         finally:
             self.is_processing = False
     
+    async def speak_fixed_reply(self, transcribed_text: str, reply: str) -> dict:
+        """Answer with a fixed reply, skipping the LLM"""
+        start_time = time.time()
+        print(f"\n🎤 Voice Input: {transcribed_text}")
+        
+        tts_success = await asyncio.to_thread(self.tts.speak_text, reply)
+        total_time = time.time() - start_time
+        llm_result = {
+            "success": True,
+            "response": reply,
+            "response_time": 0,
+            "provider": "rules"
+        }
+        
+        self.total_interactions += 1
+        if tts_success:
+            self.successful_responses += 1
+        self.display_voice_response(transcribed_text, llm_result, tts_success, total_time)
+        
+        return {
+            "success": tts_success,
+            "user_query": transcribed_text,
+            "llm_result": llm_result,
+            "tts_success": tts_success,
+            "tts_time": total_time,
+            "total_time": total_time
+        }
+    
     def display_voice_response(self, query: str, llm_result: dict, tts_success: bool, total_time: float):
         """Display formatted voice response"""
         print("\n" + "🎤" * 35)
@@ -281,7 +577,7 @@ class CompleteVoiceAssistant:
                     continue
                 
                 # Process through voice pipeline
-                result = self.process_voice_query(user_input)
+                result = self.run(self.process_voice_query(user_input))
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Shutting down voice assistant...")
@@ -290,9 +586,22 @@ class CompleteVoiceAssistant:
                 print(f"\n❌ Error: {e}")
                 continue
         
+        # Release pooled connections
+        self.close()
+        
         # Show session summary
         self.show_session_summary()
     
+    def close(self):
+        """Save the response cache and close the HTTP client and its event loop"""
+        self.llm_cache.save()
+        if not self.loop.is_closed():
+            self.groq_warm_up.cancel()
+            self.run(self.client.aclose())
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop_thread.join()
+            self.loop.close()
+    
     def show_session_summary(self):
         """Show session summary"""
         session_duration = datetime.now() - self.session_start
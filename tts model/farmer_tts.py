@@ -4,14 +4,23 @@ Farmer TTS (Text-to-Speech) System
 Converts LLM farming advice text to natural Hindi voice
 """
 
+import io
 import os
+import re
 import sys
 import time
+import atexit
+import hashlib
+import functools
 import threading
+from pathlib import Path
 from datetime import datetime
-import tempfile
+from collections import deque
 import subprocess
 
+# Importing tts_common also routes gTTS through pooled keep-alive sessions
+from tts_common import warm_up_gtts
+
 # TTS Libraries
 PYTTSX3_AVAILABLE = False
 GTTS_AVAILABLE = False
@@ -39,6 +48,27 @@ try:
 except ImportError as e:
     print(f"⚠️ requests not available: {e}")
 
+# Spoken before every farming response
+INTRO_TEXT = "किसान सहायक का जवाब:"
+
+# Substrings identifying a Hindi-capable pyttsx3 voice
+HINDI_VOICE_KEYWORDS = ('hindi', 'india', 'zira', 'ravi')
+
+# Characters stripped before speech
+_EMOJI_TABLE = str.maketrans({c: None for c in "💬✅❌🌾🎯"})
+
+# English words replaced with Hindi equivalents for better pronunciation,
+# all substituted in a single regex pass
+_REPLACEMENTS = {
+    "NPK": "एन पी के",
+    "DAP": "डी ए पी",
+    "kg": "किलो",
+    "quintal": "क्विंटल",
+    "acre": "एकड़",
+    "hectare": "हेक्टेयर"
+}
+_REPLACEMENT_PATTERN = re.compile("|".join(map(re.escape, _REPLACEMENTS)))
+
 
 class FarmerTTS:
     """Advanced TTS system for farmer responses"""
@@ -51,8 +81,10 @@ class FarmerTTS:
         self.tts_engines = {}
         self.current_engine = None
         
-        # Initialize available engines
-        self.initialize_engines()
+        # gTTS audio is cached on disk by text, so repeated phrases are not
+        # synthesized again
+        self.cache_dir = Path("~/.farmer_tts_cache").expanduser()
+        self.cache_dir.mkdir(exist_ok=True)
         
         # TTS settings
         self.voice_settings = {
@@ -62,10 +94,28 @@ class FarmerTTS:
             "gender": "female"  # Voice gender preference
         }
         
+        # Voice currently set on the pyttsx3 engine (the Hindi voice once it
+        # is configured), so set_voice_settings only switches on a change
+        self.pyttsx3_voice_id = None
+        
+        # Initialize available engines
+        self.initialize_engines()
+        
         # Session tracking
         self.session_start = datetime.now()
         self.total_speeches = 0
         self.successful_speeches = 0
+        self.total_speech_ns = 0
+        
+        # speak_text only records (success, duration_ns) events; a background
+        # thread folds them into the totals off the speech path
+        self._events = deque(maxlen=1024)
+        self._stats_lock = threading.Lock()
+        threading.Thread(target=self.stats_worker, daemon=True).start()
+        
+        # Synthesize the fixed intro in the background so it is ready to play
+        if self.current_engine == "gtts":
+            threading.Thread(target=self.prewarm_cache, args=([INTRO_TEXT],), daemon=True).start()
     
     def initialize_engines(self):
         """Initialize available TTS engines"""
@@ -82,6 +132,9 @@ class FarmerTTS:
                     "hindi_support": "basic"
                 }
                 print("✅ pyttsx3 engine initialized (Offline)")
+                
+                # Configure voice, rate and volume once, not per utterance
+                self.configure_pyttsx3()
             except Exception as e:
                 print(f"⚠️ pyttsx3 initialization failed: {e}")
         
@@ -90,6 +143,11 @@ class FarmerTTS:
             try:
                 # Test gTTS
                 test_tts = gTTS(text="test", lang="hi")
+                
+                # Open the audio device once for the whole session
+                pygame.mixer.init(frequency=22050)
+                atexit.register(pygame.mixer.quit)
+                
                 self.tts_engines["gtts"] = {
                     "engine": "gtts",
                     "type": "online",
@@ -154,17 +212,15 @@ class FarmerTTS:
             # Set volume
             engine.setProperty('volume', self.voice_settings["volume"])
             
-            # Try to find Hindi voice
-            voices = engine.getProperty('voices')
-            hindi_voice = None
-            
-            for voice in voices:
-                voice_name = voice.name.lower()
-                if any(keyword in voice_name for keyword in ['hindi', 'india', 'zira', 'ravi']):
-                    hindi_voice = voice
-                    break
+            # Try to find Hindi voice (voices are enumerated once, here)
+            hindi_voice = next(
+                (voice for voice in engine.getProperty('voices')
+                 if any(keyword in voice.name.lower() for keyword in HINDI_VOICE_KEYWORDS)),
+                None
+            )
             
             if hindi_voice:
+                self.pyttsx3_voice_id = hindi_voice.id
                 engine.setProperty('voice', hindi_voice.id)
                 print(f"✅ Hindi voice selected: {hindi_voice.name}")
             else:
@@ -176,14 +232,23 @@ class FarmerTTS:
             print(f"❌ pyttsx3 configuration failed: {e}")
             return False
     
+    def set_voice_settings(self, voice_id=None, **settings):
+        """Update voice settings, reapplying changed rate/volume/voice to pyttsx3"""
+        changed = {key for key, value in settings.items() if self.voice_settings.get(key) != value}
+        self.voice_settings.update(settings)
+        if "pyttsx3" in self.tts_engines:
+            engine = self.tts_engines["pyttsx3"]["engine"]
+            for key in changed & {"rate", "volume"}:
+                engine.setProperty(key, self.voice_settings[key])
+            if voice_id is not None and voice_id != self.pyttsx3_voice_id:
+                engine.setProperty('voice', voice_id)
+                self.pyttsx3_voice_id = voice_id
+    
     def speak_with_pyttsx3(self, text: str) -> bool:
         """Speak text using pyttsx3"""
         try:
             engine = self.tts_engines["pyttsx3"]["engine"]
             
-            # Configure engine
-            self.configure_pyttsx3()
-            
             # Speak text
             engine.say(text)
             engine.runAndWait()
@@ -194,34 +259,55 @@ class FarmerTTS:
             print(f"❌ pyttsx3 speech failed: {e}")
             return False
     
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def gtts_audio(cache_dir: Path, text: str, lang: str) -> bytes:
+        """Return the MP3 for text from memory or disk, synthesizing it with gTTS if needed"""
+        key = hashlib.sha256(f"{lang}:{text}".encode("utf-8")).hexdigest()
+        path = cache_dir / f"{key}.mp3"
+        if path.exists():
+            return path.read_bytes()
+        
+        # Synthesize in memory, then store under a temporary name first so a
+        # failed write never leaves a partial file in the cache
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=False).write_to_fp(buffer)
+        audio = buffer.getvalue()
+        tmp_path = cache_dir / f"{key}.{threading.get_ident()}.tmp"
+        tmp_path.write_bytes(audio)
+        os.replace(tmp_path, path)
+        return audio
+    
+    def prewarm_cache(self, texts):
+        """Synthesize texts into the gTTS cache ahead of time"""
+        for text in texts:
+            try:
+                self.gtts_audio(self.cache_dir, text, "hi")
+            except Exception as e:
+                print(f"⚠️ gTTS cache warm-up failed: {e}")
+    
+    @staticmethod
+    def warm_up_connection():
+        """Open the pooled gTTS connection to Google before the first
+        synthesis (failures are ignored)"""
+        if GTTS_AVAILABLE:
+            warm_up_gtts()
+    
     def speak_with_gtts(self, text: str) -> bool:
         """Speak text using Google TTS"""
         try:
-            # Create gTTS object
-            tts = gTTS(text=text, lang="hi", slow=False)
-            
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-                temp_filename = tmp_file.name
-                tts.save(temp_filename)
+            audio = self.gtts_audio(self.cache_dir, text, "hi")
             
-            # Play audio using pygame
+            # Play audio using pygame, straight from memory
             if GTTS_AVAILABLE:
-                pygame.mixer.init()
-                pygame.mixer.music.load(temp_filename)
-                pygame.mixer.music.play()
-                
-                # Wait for playback to finish
-                while pygame.mixer.music.get_busy():
-                    time.sleep(0.1)
-                
-                pygame.mixer.quit()
-            
-            # Clean up temporary file
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
+                sound = pygame.mixer.Sound(io.BytesIO(audio))
+                channel = sound.play()
+
+                # Wait for playback to finish: sleep for the clip's length,
+                # then poll only for the last few milliseconds of output
+                time.sleep(sound.get_length())
+                while channel.get_busy():
+                    pygame.time.wait(10)
             
             return True
             
@@ -250,8 +336,11 @@ class FarmerTTS:
             print(f"❌ SAPI speech failed: {e}")
             return False
     
-    def speak_text(self, text: str) -> bool:
-        """Main function to convert text to speech"""
+    def speak_text(self, text: str, record: bool = True) -> bool:
+        """Main function to convert text to speech
+
+        With record=False the utterance is left out of the session stats.
+        """
         if not text or not text.strip():
             print("⚠️ Empty text provided")
             return False
@@ -262,7 +351,7 @@ class FarmerTTS:
         
         print(f"🔊 Speaking with {self.current_engine}: {text[:50]}...")
         
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         success = False
         
         try:
@@ -274,12 +363,12 @@ class FarmerTTS:
             elif self.current_engine == "sapi":
                 success = self.speak_with_sapi(text)
             
-            speech_time = time.time() - start_time
+            speech_ns = time.perf_counter_ns() - start_ns
+            if record:
+                self._events.append((success, speech_ns))
             
-            # Update statistics
-            self.total_speeches += 1
+            speech_time = speech_ns / 1e9
             if success:
-                self.successful_speeches += 1
                 print(f"✅ Speech completed in {speech_time:.2f}s")
             else:
                 print(f"❌ Speech failed after {speech_time:.2f}s")
@@ -298,35 +387,22 @@ class FarmerTTS:
         # Clean text for better speech
         cleaned_text = self.clean_text_for_speech(llm_response)
         
-        # Add intro if needed
+        # Add intro if needed; it is spoken on its own so it plays from cache,
+        # and only the response itself counts in the session stats
+        intro_success = True
         if metadata and metadata.get("add_intro", False):
-            intro = "किसान सहायक का जवाब: "
-            cleaned_text = intro + cleaned_text
+            intro_success = self.speak_text(INTRO_TEXT, record=False)
         
         # Speak the text
-        return self.speak_text(cleaned_text)
+        return self.speak_text(cleaned_text) and intro_success
     
     def clean_text_for_speech(self, text: str) -> str:
         """Clean text for better speech synthesis"""
         # Remove special characters that might cause issues
-        text = text.replace("💬", "")
-        text = text.replace("✅", "")
-        text = text.replace("❌", "")
-        text = text.replace("🌾", "")
-        text = text.replace("🎯", "")
+        text = text.translate(_EMOJI_TABLE)
         
         # Replace English words with Hindi equivalents for better pronunciation
-        replacements = {
-            "NPK": "एन पी के",
-            "DAP": "डी ए पी",
-            "kg": "किलो",
-            "quintal": "क्विंटल",
-            "acre": "एकड़",
-            "hectare": "हेक्टेयर"
-        }
-        
-        for eng, hindi in replacements.items():
-            text = text.replace(eng, hindi)
+        text = _REPLACEMENT_PATTERN.sub(lambda m: _REPLACEMENTS[m.group(0)], text)
         
         # Clean up extra spaces
         text = " ".join(text.split())
@@ -355,19 +431,39 @@ class FarmerTTS:
             
             time.sleep(1)  # Pause between tests
     
+    def drain_stats(self):
+        """Fold recorded speech events into the session totals"""
+        events = self._events
+        with self._stats_lock:
+            while events:
+                success, speech_ns = events.popleft()
+                self.total_speeches += 1
+                self.successful_speeches += success
+                self.total_speech_ns += speech_ns
+    
+    def stats_worker(self):
+        """Periodically drain speech events in the background"""
+        while True:
+            time.sleep(1.0)
+            self.drain_stats()
+    
     def get_session_summary(self) -> dict:
         """Get TTS session summary"""
+        self.drain_stats()
         session_duration = datetime.now() - self.session_start
         
         success_rate = 0
+        average_speech_time = 0
         if self.total_speeches > 0:
             success_rate = (self.successful_speeches / self.total_speeches) * 100
+            average_speech_time = self.total_speech_ns / self.total_speeches / 1e9
         
         return {
             "session_duration": str(session_duration),
             "total_speeches": self.total_speeches,
             "successful_speeches": self.successful_speeches,
             "success_rate": success_rate,
+            "average_speech_time": average_speech_time,
             "current_engine": self.current_engine,
             "available_engines": list(self.tts_engines.keys())
         }
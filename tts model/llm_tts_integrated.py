@@ -6,10 +6,90 @@ Takes LLM farming advice and converts to natural Hindi speech
 
 import os
 import sys
+import json
 import time
+import hashlib
+import asyncio
 import threading
 from datetime import datetime
 
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from tts_common import split_sentences, drop_unfinished, iter_sse_sentences
+
+DISKCACHE_AVAILABLE = False
+try:
+    import diskcache  # Optional persistent cache of LLM responses
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    pass
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster JSON for Groq requests and responses
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+# Groq answers are cached on disk for a week, keyed by model, system prompt
+# and normalized question (run with --no-cache to disable)
+LLM_CACHE_DIR = os.path.expanduser("~/.farm_tak_llm_cache")
+LLM_CACHE_TTL = 7 * 86400
+
+# Interactive queries go to the fast 8B model; long questions and topics that
+# need care (disease, law, schemes) go to the 70B model. Both can be
+# overridden with GROQ_FAST_MODEL / GROQ_QUALITY_MODEL.
+LLM_MODEL_FAST = "llama-3.1-8b-instant"
+LLM_MODEL_QUALITY = "llama3-70b-8192"
+QUALITY_QUERY_LENGTH = 200
+QUALITY_KEYWORDS = ("रोग", "कानून", "योजना")
+
+# Spoken answers are 2-3 sentences, so output is capped at 120 tokens
+LLM_MAX_TOKENS = 120
+
+# Bulk mode packs several questions into one request (JSON answers keyed by
+# question number); the batch is halved whenever a request takes too long
+BULK_BATCH_SIZE = 8
+BULK_LATENCY_SLA = 10.0
+BULK_MAX_TOKENS = 200
+
+# Queries answered at the same time in interactive mode (speech is still
+# played one answer at a time)
+MAX_CONCURRENT_QUERIES = 2
+
+# Farmer-specific system prompt
+SYSTEM_PROMPT = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
+
+आपकी विशेषताएं:
+- बीज, खाद, कीटनाशक की सलाह
+- फसल रोग की पहचान और इलाज  
+- मंडी भाव और बिक्री की सलाह
+- मौसम के अनुसार खेती की सलाह
+- सरकारी योजनाओं की जानकारी
+
+जवाब हमेशा:
+- हिंदी में दें
+- 2-3 वाक्यों में संक्षिप्त हो
+- तुरंत लागू होने वाला हो
+- व्यावहारिक और उपयोगी हो
+- बोलने के लिए उपयुक्त हो (TTS के लिए)"""
+
+# llm/.env is parsed on the first setup_llm call only
+_ENV_LOADED = False
+
 # Add parent directories to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -27,11 +107,16 @@ except ImportError as e:
 class LLMTTSIntegrated:
     """Integrated LLM + TTS system for farmers"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         """Initialize integrated system"""
         print("🌾 Initializing LLM + TTS Integrated System...")
         print("=" * 60)
         
+        # Persistent LLM response cache
+        self.cache = None
+        if use_cache and DISKCACHE_AVAILABLE:
+            self.cache = diskcache.Cache(LLM_CACHE_DIR, size_limit=256 << 20)
+        
         # Initialize TTS
         print("🔊 Setting up TTS system...")
         self.tts = FarmerTTS()
@@ -49,78 +134,111 @@ class LLMTTSIntegrated:
     
     def setup_llm(self):
         """Setup LLM system"""
-        # Load environment variables
-        self.load_env()
+        # Load environment variables (once per process)
+        global _ENV_LOADED
+        if not _ENV_LOADED:
+            load_dotenv(os.path.join(parent_dir, 'llm', '.env'), override=False)
+            _ENV_LOADED = True
         
-        # Check API key
+        # Check API key (the template's placeholder does not count)
         self.api_key = os.getenv('GROQ_API_KEY')
-        if not self.api_key:
+        if not self.api_key or self.api_key == "your_api_key_here":
             print("❌ No Groq API key found!")
             print("💡 Please add GROQ_API_KEY to .env file in llm folder")
             sys.exit(1)
         
         print("✅ Groq API key loaded")
+        self.model_fast = os.getenv("GROQ_FAST_MODEL", LLM_MODEL_FAST)
+        self.model_quality = os.getenv("GROQ_QUALITY_MODEL", LLM_MODEL_QUALITY)
+        
+        # The HTTP session is set up once with the request headers; its
+        # connection pool keeps the connection to Groq open between queries
+        self.http = requests.Session()
+        self.http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        self.http.headers.update(headers)
+        
+        # Streaming queries use an async client driven by one long-lived event
+        # loop (its pooled connections are bound to the loop that opened them)
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+                retries=2
+            ),
+            timeout=httpx.Timeout(15.0, connect=3.05)
+        )
+        self.loop = asyncio.new_event_loop()
+        self.speech_lock = asyncio.Lock()
+    
+    def choose_model(self, user_query: str) -> str:
+        """Pick the Groq model for a query"""
+        if len(user_query) > QUALITY_QUERY_LENGTH or any(k in user_query for k in QUALITY_KEYWORDS):
+            return self.model_quality
+        return self.model_fast
     
-    def load_env(self):
-        """Load environment variables from llm/.env"""
-        env_file = os.path.join(os.path.dirname(current_dir), 'llm', '.env')
-        if os.path.exists(env_file):
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if '=' in line and not line.startswith('#'):
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        if value and value != "your_api_key_here":
-                            os.environ[key] = value
+    def cache_key(self, user_query: str) -> str:
+        """Cache key for a query (case and spacing do not matter)"""
+        normalized = " ".join(user_query.lower().split())
+        return hashlib.sha256(f"{self.choose_model(user_query)}|{SYSTEM_PROMPT}|{normalized}".encode("utf-8")).hexdigest()
+    
+    def cached_response(self, user_query: str):
+        """Return a cached LLM result for the query, or None"""
+        if self.cache is None:
+            return None
+        response = self.cache.get(self.cache_key(user_query))
+        if response is None:
+            return None
+        return {
+            "success": True,
+            "response": response,
+            "response_time": 0.0,
+            "provider": "groq-cache"
+        }
+    
+    def store_response(self, user_query: str, response: str):
+        """Cache a successful LLM response"""
+        if self.cache is not None and response:
+            self.cache.set(self.cache_key(user_query), response, expire=LLM_CACHE_TTL)
     
     def get_llm_response(self, user_query: str) -> dict:
         """Get response from LLM"""
-        import requests
+        cached = self.cached_response(user_query)
+        if cached:
+            return cached
+        
+        _post = self.http.post
+        _now = time.perf_counter
         
-        # Farmer-specific system prompt
-        system_prompt = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
-
-आपकी विशेषताएं:
-- बीज, खाद, कीटनाशक की सलाह
-- फसल रोग की पहचान और इलाज  
-- मंडी भाव और बिक्री की सलाह
-- मौसम के अनुसार खेती की सलाह
-- सरकारी योजनाओं की जानकारी
-
-जवाब हमेशा:
-- हिंदी में दें
-- 3-4 वाक्यों में संक्षिप्त हो
-- तुरंत लागू होने वाला हो
-- व्यावहारिक और उपयोगी हो
-- बोलने के लिए उपयुक्त हो (TTS के लिए)"""
-
         try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            url = GROQ_URL
             
             payload = {
-                "model": "llama3-70b-8192",
+                "model": self.choose_model(user_query),
                 "messages": [
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_query}
                 ],
                 "temperature": 0.7,
-                "max_tokens": 200,
+                "max_tokens": LLM_MAX_TOKENS,
                 "stream": False
             }
             
-            start_time = time.time()
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
-            response_time = time.time() - start_time
+            start_time = _now()
+            # Separate connect and read timeouts: fail fast if Groq is
+            # unreachable, but allow time for generation
+            response = _post(url, data=_json_dumps(payload), timeout=(3.05, 15))
+            response_time = _now() - start_time
             
             if response.status_code == 200:
-                result = response.json()
-                llm_response = result["choices"][0]["message"]["content"].strip()
+                choice = _json_loads(response.content)["choices"][0]
+                llm_response = choice["message"]["content"].strip()
+                if choice.get("finish_reason") == "length":
+                    llm_response = drop_unfinished(llm_response)
+                self.store_response(user_query, llm_response)
                 
                 return {
                     "success": True,
@@ -144,17 +262,186 @@ class LLMTTSIntegrated:
                 "provider": "groq"
             }
     
-    def process_farmer_query(self, user_query: str) -> dict:
-        """Complete pipeline: Query → LLM → TTS"""
+    async def aget_llm_response(self, user_query: str, on_sentence=None) -> dict:
+        """Stream a response from the LLM, passing complete sentences to on_sentence"""
+        cached = self.cached_response(user_query)
+        if cached:
+            if on_sentence:
+                for sentence in split_sentences(cached["response"]):
+                    on_sentence(sentence)
+            return cached
+        
+        payload = {
+            "model": self.choose_model(user_query),
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_query}
+            ],
+            "temperature": 0.7,
+            "max_tokens": LLM_MAX_TOKENS,
+            "stream": True
+        }
+        
+        try:
+            start_time = time.perf_counter()
+            async with self.client.stream("POST", GROQ_URL, content=_json_dumps(payload)) as response:
+                if response.status_code == 200:
+                    # Hand off every finished sentence as soon as it arrives
+                    sentences = []
+                    async for sentence in iter_sse_sentences(response.aiter_lines()):
+                        sentences.append(sentence)
+                        if on_sentence:
+                            on_sentence(sentence)
+                    llm_response = " ".join(sentences)
+            response_time = time.perf_counter() - start_time
+            
+            if response.status_code == 200:
+                self.store_response(user_query, llm_response)
+                return {
+                    "success": True,
+                    "response": llm_response,
+                    "response_time": response_time,
+                    "provider": "groq"
+                }
+            else:
+                return {
+                    "success": False,
+                    "response": f"API Error: {response.status_code}",
+                    "response_time": response_time,
+                    "provider": "groq"
+                }
+                
+        except Exception as e:
+            return {
+                "success": False,
+                "response": f"Error: {str(e)}",
+                "response_time": 0,
+                "provider": "groq"
+            }
+    
+    def get_llm_responses_bulk(self, queries: list) -> list:
+        """Answer several queries with a single LLM request"""
+        questions = "\n".join(f"{i}. {query}" for i, query in enumerate(queries, 1))
+        model = self.model_fast
+        if any(self.choose_model(query) == self.model_quality for query in queries):
+            model = self.model_quality
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": (
+                    "नीचे दिए हर सवाल का जवाब हिंदी में दें। केवल JSON object लौटाएं, "
+                    'जैसे {"1": "जवाब", "2": "जवाब"}:\n' + questions
+                )}
+            ],
+            "temperature": 0.7,
+            "max_tokens": BULK_MAX_TOKENS * len(queries),
+            "response_format": {"type": "json_object"},
+            "stream": False
+        }
+        
+        def failed(message, response_time=0):
+            return [{
+                "success": False,
+                "response": message,
+                "response_time": response_time,
+                "provider": "groq"
+            } for _ in queries]
+        
+        try:
+            start_time = time.perf_counter()
+            response = self.http.post(GROQ_URL, data=_json_dumps(payload), timeout=(3.05, 30))
+            response_time = time.perf_counter() - start_time
+            
+            if response.status_code != 200:
+                return failed(f"API Error: {response.status_code}", response_time)
+            
+            content = _json_loads(response.content)["choices"][0]["message"]["content"]
+            answers = _json_loads(content)
+        except Exception as e:
+            return failed(f"Error: {str(e)}")
+        
+        if not isinstance(answers, dict):
+            return failed("API Error: batch answer is not a JSON object", response_time)
+        
+        results = []
+        for i, query in enumerate(queries, 1):
+            answer = str(answers.get(str(i)) or "").strip()
+            if answer:
+                self.store_response(query, answer)
+            results.append({
+                "success": bool(answer),
+                "response": answer or "API Error: answer missing from batch",
+                "response_time": response_time,
+                "provider": "groq-bulk"
+            })
+        return results
+    
+    def process_farmer_queries_bulk(self, queries: list) -> list:
+        """Answer a list of queries (text only) in batched LLM requests
+        
+        Cached queries are answered directly; the rest are sent in batches of
+        up to BULK_BATCH_SIZE, halving the batch while requests exceed
+        BULK_LATENCY_SLA seconds.
+        """
+        results = [self.cached_response(query) for query in queries]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        batch_size = BULK_BATCH_SIZE
+        while pending:
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            print(f"🤖 Asking {len(batch)} questions in one request...")
+            
+            batch_results = self.get_llm_responses_bulk([queries[i] for i in batch])
+            for i, result in zip(batch, batch_results):
+                results[i] = result
+            
+            if batch_results[0]["response_time"] > BULK_LATENCY_SLA and batch_size > 1:
+                batch_size //= 2
+        
+        self.total_interactions += len(queries)
+        self.successful_responses += sum(result["success"] for result in results)
+        return results
+    
+    async def speak_sentences(self, sentences: asyncio.Queue) -> list:
+        """Speak queued sentences in order until None; returns each result
+        
+        Holds the speech lock throughout, so answers are never spoken over
+        each other and play in the order their queries were started.
+        """
+        results = []
+        async with self.speech_lock:
+            while (sentence := await sentences.get()) is not None:
+                results.append(await asyncio.to_thread(
+                    self.tts.speak_farming_response, sentence, {"add_intro": not results}
+                ))
+        return results
+    
+    async def aprocess_farmer_query(self, user_query: str) -> dict:
+        """Complete pipeline: Query → LLM → TTS, speaking while the LLM streams"""
         print(f"\n🌾 Processing: {user_query}")
         
         start_time = time.time()
         
-        # Step 1: Get LLM response
+        # Step 1: Get LLM response; each sentence is spoken as soon as it
+        # arrives while the rest is still being generated
         print("🤖 Step 1: Getting LLM response...")
-        llm_result = self.get_llm_response(user_query)
+        sentences = asyncio.Queue()
+        speaker = asyncio.create_task(self.speak_sentences(sentences))
+        tts_start = None
+        
+        def speak_sentence(sentence):
+            nonlocal tts_start
+            if tts_start is None:
+                tts_start = time.time()
+            sentences.put_nowait(sentence)
+        
+        llm_result = await self.aget_llm_response(user_query, on_sentence=speak_sentence)
+        sentences.put_nowait(None)
         
         if not llm_result["success"]:
+            await speaker
             print(f"❌ LLM failed: {llm_result['response']}")
             return {
                 "success": False,
@@ -166,15 +453,13 @@ class LLMTTSIntegrated:
         
         print(f"✅ LLM response received ({llm_result['response_time']:.2f}s)")
         
-        # Step 2: Convert to speech
+        # Step 2: Wait for the remaining speech
         print("🔊 Step 2: Converting to speech...")
-        tts_start = time.time()
-        
-        tts_success = self.tts.speak_farming_response(
-            llm_result["response"], 
-            {"add_intro": True}
-        )
+        spoken = await speaker
+        tts_success = bool(spoken) and all(spoken)
         
+        if tts_start is None:
+            tts_start = time.time()
         tts_time = time.time() - tts_start
         total_time = time.time() - start_time
         
@@ -197,6 +482,19 @@ class LLMTTSIntegrated:
             "total_time": total_time
         }
     
+    def process_farmer_query(self, user_query: str) -> dict:
+        """Complete pipeline: Query → LLM → TTS"""
+        return self.loop.run_until_complete(self.aprocess_farmer_query(user_query))
+    
+    def close(self):
+        """Close the HTTP clients and the event loop"""
+        self.http.close()
+        if self.cache is not None:
+            self.cache.close()
+        if not self.loop.is_closed():
+            self.loop.run_until_complete(self.client.aclose())
+            self.loop.close()
+    
     def display_response(self, result: dict):
         """Display formatted response"""
         print("\n" + "🌾" * 40)
@@ -218,6 +516,60 @@ class LLMTTSIntegrated:
         print(f"🎯 Success: {'✅' if result['success'] else '❌'}")
         print("-" * 80)
     
+    def read_queries(self, loop, queries: asyncio.Queue):
+        """Read questions from the terminal into the queue (None on quit)
+        
+        Runs on a daemon thread, so a read still waiting when the user
+        presses Ctrl+C does not keep the process alive at exit. It reads an
+        unbuffered view of stdin: a daemon thread blocked inside sys.stdin
+        would hold its buffer lock and abort interpreter shutdown.
+        """
+        stdin = open(sys.stdin.fileno(), "rb", buffering=0, closefd=False)
+        while True:
+            print("\n🎤 आपका सवाल: ", end="", flush=True)
+            line = stdin.readline()
+            user_input = line.decode("utf-8", errors="replace").strip() if line else "quit"
+            
+            if user_input.lower() in ['quit', 'exit', 'बाहर', 'बंद']:
+                print("\n👋 धन्यवाद! खेती में सफलता की शुभकामनाएं!")
+                loop.call_soon_threadsafe(queries.put_nowait, None)
+                return
+            
+            if not user_input:
+                print("⚠️ कृपया अपना सवाल लिखें।")
+                continue
+            
+            loop.call_soon_threadsafe(queries.put_nowait, user_input)
+    
+    async def answer_query(self, user_query: str, limit: asyncio.Semaphore):
+        """Process and display one query, then free its concurrency slot"""
+        try:
+            result = await self.aprocess_farmer_query(user_query)
+            self.display_response(result)
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+        finally:
+            limit.release()
+    
+    async def answer_queries(self, queries: asyncio.Queue):
+        """Answer queued questions, up to MAX_CONCURRENT_QUERIES at a time"""
+        limit = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        tasks = set()
+        while (user_query := await queries.get()) is not None:
+            await limit.acquire()
+            task = asyncio.create_task(self.answer_query(user_query, limit))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    
+    async def arun_interactive_system(self):
+        """Read new questions while earlier answers are still being spoken"""
+        queries = asyncio.Queue()
+        threading.Thread(
+            target=self.read_queries, args=(asyncio.get_running_loop(), queries), daemon=True
+        ).start()
+        await self.answer_queries(queries)
+    
     def run_interactive_system(self):
         """Run interactive LLM + TTS system"""
         print("\n🌾 LLM + TTS Farmer Assistant")
@@ -225,33 +577,16 @@ class LLMTTSIntegrated:
         print("💡 Type your farming questions in Hindi or English")
         print("💡 You will hear the response as speech!")
         print("💡 Type 'quit' to exit")
+        print("💡 You can type the next question while an answer is spoken")
         print("=" * 60)
         
-        while True:
-            try:
-                # Get user input
-                user_input = input("\n🎤 आपका सवाल: ").strip()
-                
-                if user_input.lower() in ['quit', 'exit', 'बाहर', 'बंद']:
-                    print("\n👋 धन्यवाद! खेती में सफलता की शुभकामनाएं!")
-                    break
-                
-                if not user_input:
-                    print("⚠️ कृपया अपना सवाल लिखें।")
-                    continue
-                
-                # Process query through complete pipeline
-                result = self.process_farmer_query(user_input)
-                
-                # Display response
-                self.display_response(result)
-                
-            except KeyboardInterrupt:
-                print("\n\n👋 सिस्टम बंद कर रहे हैं...")
-                break
-            except Exception as e:
-                print(f"\n❌ Error: {e}")
-                continue
+        try:
+            self.loop.run_until_complete(self.arun_interactive_system())
+        except KeyboardInterrupt:
+            print("\n\n👋 सिस्टम बंद कर रहे हैं...")
+        
+        # Release pooled connections
+        self.close()
         
         # Show session summary
         self.show_session_summary()
@@ -280,7 +615,18 @@ def main():
     """Main function"""
     try:
         # Initialize integrated system
-        system = LLMTTSIntegrated()
+        system = LLMTTSIntegrated(use_cache="--no-cache" not in sys.argv)
+        
+        # Bulk mode: answer every question in a file (one per line) as text
+        if "--bulk" in sys.argv:
+            with open(sys.argv[sys.argv.index("--bulk") + 1], 'r', encoding='utf-8') as f:
+                queries = [line.strip() for line in f if line.strip()]
+            
+            for query, result in zip(queries, system.process_farmer_queries_bulk(queries)):
+                print(f"\n❓ {query}")
+                print(f"💬 {result['response']}")
+            system.close()
+            return
         
         # Run interactive system
         system.run_interactive_system()
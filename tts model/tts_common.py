@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Shared TTS Helpers
+Sentence splitting, Groq stream parsing and gTTS connection reuse shared by
+every voice pipeline
+"""
+
+import os
+import re
+import json
+import threading
+
+ORJSON_AVAILABLE = False
+GTTS_AVAILABLE = False
+
+try:
+    import orjson  # Optional faster JSON for stream chunks
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    import gtts.tts
+    import requests
+    from requests.adapters import HTTPAdapter
+    GTTS_AVAILABLE = True
+except ImportError:
+    pass
+
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Host gTTS synthesizes speech through
+GTTS_HOST = "translate.google.com"
+
+# A sentence ends at a danda, question mark, exclamation mark or full stop
+# followed by whitespace (so decimals like "2.5" are not split)
+SENTENCE_END = re.compile(r'[।?!.](?=\s)')
+SENTENCE_TERMINATORS = ("।", "?", "!", ".")
+
+
+def split_sentences(text: str) -> list:
+    """Split text into sentences, keeping each terminator"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(text):
+        sentences.append(text[start:match.end()].strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+    return [sentence for sentence in sentences if sentence]
+
+
+def drop_unfinished(text: str) -> str:
+    """Drop a trailing sentence cut off by the token cap, keeping the rest
+
+    Used when Groq reports finish_reason "length"; an answer that is a single
+    unfinished sentence is kept whole rather than dropped.
+    """
+    sentences = split_sentences(text)
+    if len(sentences) > 1 and not sentences[-1].endswith(SENTENCE_TERMINATORS):
+        sentences.pop()
+    return " ".join(sentences)
+
+
+async def iter_sse_sentences(lines):
+    """Yield each finished sentence of a streamed Groq chat completion
+
+    lines is the response's aiter_lines(); a sentence is yielded as soon as
+    its terminator and the following whitespace have arrived. If the stream
+    stopped at the token cap, the unfinished last sentence is dropped.
+    """
+    pending = ""
+    finish_reason = None
+    yielded = False
+    async for line in lines:
+        if not line.startswith("data: "):
+            continue
+        data = line[6:]
+        if data == "[DONE]":
+            break
+        choice = _json_loads(data)["choices"][0]
+        finish_reason = choice.get("finish_reason") or finish_reason
+        delta = choice["delta"].get("content")
+        if not delta:
+            continue
+        pending += delta
+
+        ends = [m.end() for m in SENTENCE_END.finditer(pending)]
+        if ends:
+            sentence, pending = pending[:ends[-1]].strip(), pending[ends[-1]:]
+            if sentence:
+                yielded = True
+                yield sentence
+
+    pending = pending.strip()
+    cut_off = finish_reason == "length" and not pending.endswith(SENTENCE_TERMINATORS)
+    if pending and not (cut_off and yielded):
+        yield pending
+
+
+if GTTS_AVAILABLE:
+    class _GttsSession(requests.Session):
+        """Session that outlives gTTS's `with requests.Session()` block"""
+
+        def close(self):
+            pass
+
+    class _GttsRequests:
+        """Stands in for the requests module inside gtts.tts, handing every
+        gTTS call its thread's session instead of a fresh one"""
+
+        def __getattr__(self, name):
+            return getattr(requests, name)
+
+        @staticmethod
+        def Session():
+            return gtts_session()
+
+    _gtts_local = threading.local()
+
+    def _new_gtts_pool():
+        """Start a fresh keep-alive pool; a forked child must not reuse the
+        parent's open TLS sockets"""
+        global _gtts_adapter, _gtts_local
+        _gtts_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        _gtts_local = threading.local()
+
+    def gtts_session():
+        """This thread's gTTS session
+
+        requests sessions are not thread-safe, so each thread has its own, but
+        all of them mount one adapter: its urllib3 pool is thread-safe, so a
+        connection opened (or warmed up) on any thread is reused by every one.
+        """
+        session = getattr(_gtts_local, "session", None)
+        if session is None:
+            session = _gtts_local.session = _GttsSession()
+            session.mount("https://", _gtts_adapter)
+        return session
+
+    # gTTS opens a new session per request, paying DNS and the TLS handshake
+    # to Google on every sentence; its calls use the pooled sessions instead
+    _new_gtts_pool()
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_new_gtts_pool)
+    gtts.tts.requests = _GttsRequests()
+
+
+def warm_up_gtts():
+    """Open a pooled gTTS connection to Google before the first synthesis
+    (failures are ignored)"""
+    if not GTTS_AVAILABLE:
+        return
+    try:
+        # gTTS sends with verify=False and connections are pooled per TLS
+        # setting, so the warm-up must match; silence the warning as gTTS does
+        requests.packages.urllib3.disable_warnings(
+            requests.packages.urllib3.exceptions.InsecureRequestWarning
+        )
+        gtts_session().head(f"https://{GTTS_HOST}", verify=False, timeout=5)
+    except Exception:
+        pass
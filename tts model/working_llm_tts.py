@@ -4,10 +4,20 @@ Working LLM + TTS System
 Direct imports and simple implementation
 """
 
+import io
 import os
+import re
 import sys
+import json
 import time
+import atexit
+import shutil
+import hashlib
+import subprocess
 import tempfile
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 
 # Direct imports
@@ -15,16 +25,251 @@ import pyttsx3
 from gtts import gTTS
 import pygame
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DOTENV_AVAILABLE = False
+try:
+    from dotenv import dotenv_values  # Optional, used to parse llm/.env
+    DOTENV_AVAILABLE = True
+except ImportError:
+    pass
+
+DISKCACHE_AVAILABLE = False
+try:
+    import diskcache  # Optional persistent cache of LLM responses
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    pass
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster JSON for Groq requests and responses
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+# Settings read from llm/.env, parsed once per process
+ENV_ASSIGNMENT = re.compile(rb'(?m)^\s*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*([^\r\n#]*)')
+_ENV_CACHE = {}
+
+# Groq answers are cached on disk for a week, keyed by model, system prompt
+# and normalized question (run with --no-cache to disable)
+LLM_CACHE_DIR = os.path.expanduser("~/.farm_tak_llm_cache")
+LLM_CACHE_TTL = 7 * 86400
+
+# Interactive queries go to the fast 8B model; long questions and topics that
+# need care (disease, law, schemes) go to the 70B model. Both can be
+# overridden with GROQ_FAST_MODEL / GROQ_QUALITY_MODEL.
+LLM_MODEL_FAST = "llama-3.1-8b-instant"
+LLM_MODEL_QUALITY = "llama3-70b-8192"
+QUALITY_QUERY_LENGTH = 200
+QUALITY_KEYWORDS = ("रोग", "कानून", "योजना")
+
+# Synthesized speech is kept on disk keyed by engine, language and text;
+# least recently used files are removed once the cache exceeds its limit
+TTS_CACHE_DIR = os.path.join(tempfile.gettempdir(), "farm_tts_cache")
+TTS_CACHE_LIMIT = 100 * 1024 * 1024
+# Recently spoken audio is also kept in memory
+TTS_MEMORY_CACHE_SIZE = 64
+
+# Rate limits and gateway errors from Groq are retried with exponential
+# backoff, honoring Retry-After (capped), as are failed connects. Read
+# timeouts are not retried: the answer is already late, and each retry could
+# stall for the full read timeout again
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_AFTER_MAX = 4.0
+RETRY_CONNECT = 2
+
+# Hit while the TTS engines start so DNS and the Groq TLS connection are ready
+# and gTTS has been exercised end to end
+GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
+GTTS_WARM_UP_TEXT = "ओक"
+WARM_UP_TIMEOUT = 3
+
+# Connect/read timeouts for upstream calls, short so breakers trip quickly
+GROQ_TIMEOUT = (3, 10)
+GTTS_TIMEOUT = (3, 10)
+
+# Spoken instead of an answer while Groq keeps failing
+BUSY_REPLY = "सर्वर व्यस्त है, कृपया थोड़ी देर बाद पूछें।"
+
+# Local Piper voice, preferred over gTTS when the binary and model are present
+PIPER_BINARY = os.getenv("PIPER_BINARY", "piper")
+PIPER_MODEL = os.getenv("PIPER_MODEL", "hi_IN-pratham-medium.onnx")
+
+# Spoken before every answer
+INTRO_TEXT = "किसान सहायक का जवाब:"
+
+# Answers are spoken sentence by sentence so synthesis overlaps playback
+SENTENCE_SPLIT = re.compile(r'(?<=[।?!.])\s+')
+
+SYSTEM_PROMPT = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
+
+जवाब हमेशा:
+- हिंदी में दें
+- 2-3 वाक्यों में संक्षिप्त हो
+- तुरंत लागू होने वाला हो
+- बोलने के लिए उपयुक्त हो"""
+
+
+class BoundedRetry(Retry):
+    """urllib3 Retry that caps how long a Retry-After header can make us wait"""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, RETRY_AFTER_MAX)
+
+
+def make_retry():
+    """Retry policy for Groq requests (jitter needs urllib3 2)"""
+    settings = dict(
+        total=4,
+        connect=RETRY_CONNECT,
+        read=0,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["POST"],
+        backoff_factor=0.5,
+        respect_retry_after_header=True
+    )
+    try:
+        return BoundedRetry(**settings, backoff_jitter=0.3)
+    except TypeError:
+        return BoundedRetry(**settings)
+
+
+class CircuitBreaker:
+    """Stops calling an upstream for a while after repeated failures
+    
+    Once reset_sec has passed, a single probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, fail_threshold=3, window_sec=30, reset_sec=30):
+        self.fail_threshold = fail_threshold
+        self.window_sec = window_sec
+        self.reset_sec = reset_sec
+        self.failures = deque(maxlen=fail_threshold)
+        self.open_until = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+    
+    def allow(self):
+        """True if a call may go to the upstream"""
+        with self.lock:
+            if not self.open_until:
+                return True
+            if self.probing or time.monotonic() < self.open_until:
+                return False
+            self.probing = True
+            return True
+    
+    def record(self, success):
+        """Record a call result; open the circuit on fail_threshold failures within window_sec"""
+        with self.lock:
+            now = time.monotonic()
+            if success:
+                self.failures.clear()
+                self.open_until = 0.0
+            elif self.probing:
+                self.open_until = now + self.reset_sec
+            else:
+                self.failures.append(now)
+                if len(self.failures) == self.fail_threshold and now - self.failures[0] <= self.window_sec:
+                    self.open_until = now + self.reset_sec
+                    self.failures.clear()
+            self.probing = False
+
+
+class PiperTTS:
+    """Local neural TTS through one long-running Piper process
+    
+    The voice is loaded once: each sentence is written to Piper's stdin as a
+    line, and Piper answers on stdout with the path of the WAV file it wrote
+    for it. The process is restarted if it dies.
+    """
+    
+    def __init__(self, model=PIPER_MODEL, binary=PIPER_BINARY):
+        self.binary = shutil.which(binary)
+        self.model = model
+        if not self.binary or not os.path.exists(model):
+            raise FileNotFoundError(f"Piper binary or model not found ({binary}, {model})")
+        
+        self.output_dir = tempfile.mkdtemp(prefix="farm_piper_")
+        self.lock = threading.Lock()  # One sentence in flight at a time
+        self.process = None
+        self.start()
+        atexit.register(self.close)
+    
+    def start(self):
+        """Start (or restart) the Piper process"""
+        self.process = subprocess.Popen(
+            [self.binary, "--model", self.model, "--output_dir", self.output_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+    
+    def synthesize(self, text):
+        """Synthesize text into an in-memory WAV file"""
+        line = " ".join(text.split())  # Piper reads one sentence per line
+        with self.lock:
+            if self.process.poll() is not None:
+                self.start()
+            try:
+                self.process.stdin.write(line + "\n")
+                self.process.stdin.flush()
+                path = self.process.stdout.readline().strip()
+            except OSError:
+                path = ""
+            if not path:
+                # Piper died mid-sentence; the next call starts a new one
+                self.process.kill()
+                self.process.wait()
+                raise RuntimeError("Piper exited while synthesizing")
+        
+        with open(path, "rb") as f:
+            audio = io.BytesIO(f.read())
+        os.remove(path)
+        return audio
+    
+    def close(self):
+        """Stop the Piper process and remove its output directory"""
+        if self.process and self.process.poll() is None:
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
 
 
 class WorkingLLMTTS:
     """Working LLM + TTS system"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         """Initialize system"""
         print("🌾 Working LLM + TTS System")
         print("=" * 50)
         
+        # Persistent LLM response cache
+        self.cache = None
+        if use_cache and DISKCACHE_AVAILABLE:
+            self.cache = diskcache.Cache(LLM_CACHE_DIR, size_limit=256 << 20)
+        
         # Load API key
         self.load_env()
         self.api_key = os.getenv('GROQ_API_KEY')
@@ -32,27 +277,50 @@ class WorkingLLMTTS:
             print("❌ No Groq API key found!")
             sys.exit(1)
         print("✅ Groq API key loaded")
+        self.llm_breaker = CircuitBreaker()
+        self.model_fast = os.getenv("GROQ_FAST_MODEL", LLM_MODEL_FAST)
+        self.model_quality = os.getenv("GROQ_QUALITY_MODEL", LLM_MODEL_QUALITY)
+        
+        # The HTTP session is set up once with the request headers; its
+        # connection pool keeps the connection to Groq open between queries
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                                   max_retries=make_retry()))
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
         
         # Initialize TTS engines
         self.init_tts()
         print("✅ System ready!")
     
     def load_env(self):
-        """Load .env from llm folder"""
+        """Load .env from llm folder (the file is only parsed once)"""
         env_file = os.path.join('..', 'llm', '.env')
-        if os.path.exists(env_file):
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if '=' in line and not line.startswith('#'):
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        if value and value != "your_api_key_here":
-                            os.environ[key] = value
+        if not _ENV_CACHE and os.path.exists(env_file):
+            if DOTENV_AVAILABLE:
+                values = dotenv_values(env_file)
+            else:
+                with open(env_file, 'rb') as f:
+                    data = f.read()
+                values = {m.group(1).decode(): m.group(2).decode('utf-8').strip()
+                          for m in ENV_ASSIGNMENT.finditer(data)}
+            
+            _ENV_CACHE.update((key, value) for key, value in values.items()
+                              if value and value != "your_api_key_here")
+        
+        os.environ.update(_ENV_CACHE)
     
     def init_tts(self):
         """Initialize TTS engines"""
+        # Warm up the network in the background while the engines start: the
+        # Groq ping leaves a pooled TLS connection in self.session for the
+        # first query, the tiny gTTS synthesis checks that gTTS really works
+        warm_up = ThreadPoolExecutor(max_workers=2)
+        groq_warm_up = warm_up.submit(self.session.get, GROQ_MODELS_URL, timeout=WARM_UP_TIMEOUT)
+        gtts_warm_up = warm_up.submit(self.warm_up_gtts)
+        
         try:
             self.pyttsx3_engine = pyttsx3.init()
             self.pyttsx3_engine.setProperty('rate', 150)
@@ -63,49 +331,141 @@ class WorkingLLMTTS:
             self.pyttsx3_engine = None
         
         try:
-            # Test gTTS
-            test_tts = gTTS(text="test", lang="hi")
+            # Open the audio device once for the whole session, matching
+            # gTTS output (24 kHz mono) with a small buffer for low latency
+            pygame.mixer.pre_init(24000, -16, 1, 512)
+            pygame.mixer.init()
+            atexit.register(pygame.mixer.quit)
+            self.tts_channel = pygame.mixer.Channel(0)
+        except Exception as e:
+            print(f"⚠️ Audio output init failed: {e}")
+            self.tts_channel = None
+        
+        # pygame event posted when an utterance ends (None: poll instead);
+        # the event queue needs the display module initialized
+        self.tts_end_event = None
+        if self.tts_channel:
+            try:
+                pygame.display.init()
+                self.tts_end_event = pygame.USEREVENT + 1
+                self.tts_channel.set_endevent(self.tts_end_event)
+            except pygame.error as e:
+                print(f"⚠️ Playback end events unavailable, polling instead: {e}")
+                self.tts_end_event = None
+        
+        try:
+            if not self.tts_channel:
+                raise RuntimeError("no audio output")
+            self.piper = PiperTTS()
+            print("✅ Piper engine ready")
+            self.piper_available = True
+        except Exception as e:
+            print(f"⚠️ Piper not available: {e}")
+            self.piper = None
+            self.piper_available = False
+        
+        try:
+            if not self.tts_channel:
+                raise RuntimeError("no audio output")
+            
+            self.gtts_breaker = CircuitBreaker()
+            self.audio_memory = OrderedDict()
+            self.audio_lock = threading.Lock()
             print("✅ gTTS engine ready")
             self.gtts_available = True
+            
+            # Synthesize the fixed intro in the background so it plays from cache
+            os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+            threading.Thread(target=self.prewarm_gtts, args=(INTRO_TEXT, BUSY_REPLY), daemon=True).start()
         except Exception as e:
             print(f"⚠️ gTTS init failed: {e}")
             self.gtts_available = False
+        
+        done, _ = wait([groq_warm_up, gtts_warm_up], timeout=WARM_UP_TIMEOUT)
+        warm_up.shutdown(wait=False)
+        
+        # gTTS is only given up on when the warm-up actually failed (a slow
+        # warm-up is left to the circuit breaker)
+        if self.gtts_available and gtts_warm_up in done and gtts_warm_up.exception():
+            print(f"⚠️ gTTS init failed: {gtts_warm_up.exception()}")
+            self.gtts_available = False
+    
+    @staticmethod
+    def warm_up_gtts():
+        """Synthesize a tiny phrase to exercise gTTS and translate.google.com"""
+        gTTS(text=GTTS_WARM_UP_TEXT, lang="hi", timeout=GTTS_TIMEOUT).write_to_fp(io.BytesIO())
+    
+    def choose_model(self, query: str) -> str:
+        """Pick the Groq model for a query"""
+        if len(query) > QUALITY_QUERY_LENGTH or any(k in query for k in QUALITY_KEYWORDS):
+            return self.model_quality
+        return self.model_fast
+    
+    def cache_key(self, query: str) -> str:
+        """Cache key for a query (case and spacing do not matter)"""
+        normalized = " ".join(query.lower().split())
+        return hashlib.sha256(f"{self.choose_model(query)}|{SYSTEM_PROMPT}|{normalized}".encode("utf-8")).hexdigest()
+    
+    def cached_response(self, query: str):
+        """Return a cached LLM result for the query, or None"""
+        if self.cache is None:
+            return None
+        response = self.cache.get(self.cache_key(query))
+        if response is None:
+            return None
+        return {
+            "success": True,
+            "response": response,
+            "response_time": 0.0,
+            "provider": "groq-cache"
+        }
+    
+    def store_response(self, query: str, response: str):
+        """Cache a successful LLM response"""
+        if self.cache is not None and response:
+            self.cache.set(self.cache_key(query), response, expire=LLM_CACHE_TTL)
     
     def get_llm_response(self, query):
         """Get LLM response"""
-        system_prompt = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। किसानों को हिंदी में सरल, व्यावहारिक सलाह देते हैं।
-
-जवाब हमेशा:
-- हिंदी में दें
-- 2-3 वाक्यों में संक्षिप्त हो
-- तुरंत लागू होने वाला हो
-- बोलने के लिए उपयुक्त हो"""
-
+        cached = self.cached_response(query)
+        if cached:
+            return cached
+        
+        # Groq keeps failing: answer at once with the busy message (still a
+        # failed query, so it is not counted as an answer)
+        if not self.llm_breaker.allow():
+            return {
+                "success": False,
+                "response": BUSY_REPLY,
+                "response_time": 0.0,
+                "provider": "fallback"
+            }
+        
         try:
             url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
             
             payload = {
-                "model": "llama3-70b-8192",
+                "model": self.choose_model(query),
                 "messages": [
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": query}
                 ],
                 "temperature": 0.7,
-                "max_tokens": 150,
+                "max_tokens": 120,  # 2-3 spoken sentences
                 "stream": False
             }
             
             start_time = time.time()
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+            # Separate connect and read timeouts: fail fast if Groq is
+            # unreachable, but allow time for generation
+            response = self.session.post(url, data=_json_dumps(payload), timeout=GROQ_TIMEOUT)
             response_time = time.time() - start_time
+            self.llm_breaker.record(response.status_code == 200)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 llm_response = result["choices"][0]["message"]["content"].strip()
+                self.store_response(query, llm_response)
                 return {
                     "success": True,
                     "response": llm_response,
@@ -117,8 +477,17 @@ class WorkingLLMTTS:
                     "response": f"API Error: {response.status_code}",
                     "response_time": response_time
                 }
-                
+        
+        except requests.exceptions.RetryError as e:
+            self.llm_breaker.record(False)
+            return {
+                "success": False,
+                "response": f"API Error: retries exhausted ({e})",
+                "response_time": 0
+            }
+        
         except Exception as e:
+            self.llm_breaker.record(False)
             return {
                 "success": False,
                 "response": f"Error: {str(e)}",
@@ -138,50 +507,154 @@ class WorkingLLMTTS:
             print(f"❌ pyttsx3 speech failed: {e}")
             return False
     
+    def gtts_audio(self, text, lang="hi"):
+        """Return MP3 audio for text as a file object
+        
+        Served from memory, then from the disk cache; gTTS is only called on
+        a miss, writing straight into memory.
+        """
+        key = hashlib.sha1(f"gtts|{lang}|{text}".encode("utf-8")).hexdigest()
+        with self.audio_lock:
+            audio = self.audio_memory.get(key)
+            if audio is not None:
+                self.audio_memory.move_to_end(key)
+                return io.BytesIO(audio)
+        
+        path = os.path.join(TTS_CACHE_DIR, key + ".mp3")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                audio = f.read()
+        else:
+            # translate.google.com keeps failing: let the caller fall back at once
+            if not self.gtts_breaker.allow():
+                raise RuntimeError("gTTS unavailable (circuit open)")
+            
+            buffer = io.BytesIO()
+            try:
+                gTTS(text=text, lang=lang, slow=False, timeout=GTTS_TIMEOUT).write_to_fp(buffer)
+            except Exception:
+                self.gtts_breaker.record(False)
+                raise
+            self.gtts_breaker.record(True)
+            audio = buffer.getvalue()
+            
+            # Keep a copy on disk for later sessions; write under a temporary
+            # name so a partial file is never cached
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+            self.trim_tts_cache()
+        
+        with self.audio_lock:
+            self.audio_memory[key] = audio
+            if len(self.audio_memory) > TTS_MEMORY_CACHE_SIZE:
+                self.audio_memory.popitem(last=False)
+        return io.BytesIO(audio)
+    
+    @staticmethod
+    def trim_tts_cache():
+        """Delete least recently used cache files while over the size limit"""
+        entries = []
+        for entry in os.scandir(TTS_CACHE_DIR):
+            if entry.name.endswith(".mp3"):
+                stat = entry.stat()
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= TTS_CACHE_LIMIT:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+    
+    def prewarm_gtts(self, *texts):
+        """Synthesize texts into the cache ahead of time"""
+        try:
+            for text in texts:
+                self.gtts_audio(text)
+        except Exception as e:
+            print(f"⚠️ gTTS cache warm-up failed: {e}")
+    
     def speak_with_gtts(self, text):
         """Speak using gTTS"""
         if not self.gtts_available:
             return False
         
         try:
-            tts = gTTS(text=text, lang="hi", slow=False)
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
-                temp_filename = tmp_file.name
-                tts.save(temp_filename)
-            
-            pygame.mixer.init()
-            pygame.mixer.music.load(temp_filename)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-            
-            pygame.mixer.quit()
-            
-            try:
-                os.unlink(temp_filename)
-            except:
-                pass
-            
+            self.play_file(self.gtts_audio(text))
             return True
             
         except Exception as e:
             print(f"❌ gTTS speech failed: {e}")
             return False
     
-    def speak_text(self, text):
+    def play_file(self, audio_file):
+        """Play an audio file (path or file object) and wait for it to finish"""
+        sound = pygame.mixer.Sound(audio_file)
+        if self.tts_end_event:
+            pygame.event.clear(self.tts_end_event)
+        self.tts_channel.play(sound)
+        
+        # Block on the end event (the timeout only guards against a lost
+        # event), or poll with pygame's more precise wait
+        while self.tts_channel.get_busy():
+            if self.tts_end_event:
+                if pygame.event.wait(100).type == self.tts_end_event:
+                    break
+            else:
+                pygame.time.wait(5)
+    
+    def speak_streaming(self, text, lead=None, synthesize=None):
+        """Speak text sentence by sentence, synthesizing ahead of playback
+        
+        The optional lead (e.g. the intro) is spoken first as its own sentence.
+        synthesize defaults to the cached gTTS audio.
+        """
+        synthesize = synthesize or self.gtts_audio
+        sentences = [s for s in SENTENCE_SPLIT.split(text.strip()) if s]
+        if lead:
+            sentences.insert(0, lead)
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(synthesize, sentence) for sentence in sentences]
+            
+            for sentence, future in zip(sentences, futures):
+                try:
+                    audio_file = future.result()
+                except Exception as e:
+                    print(f"❌ Speech synthesis failed: {e}")
+                    if not (self.pyttsx3_engine and self.speak_with_pyttsx3(sentence)):
+                        return False
+                    continue
+                
+                try:
+                    self.play_file(audio_file)
+                except Exception as e:
+                    print(f"❌ Speech playback failed: {e}")
+                    return False
+        
+        return True
+    
+    def speak_text(self, text, lead=None):
         """Speak text using best available engine"""
         print(f"🔊 Speaking: {text[:50]}...")
         
-        # Try gTTS first (better Hindi)
+        # Local Piper voice first (no network round-trip)
+        if self.piper_available:
+            if self.speak_streaming(text, lead, self.piper.synthesize):
+                return True
+        
+        # Then gTTS (better Hindi than pyttsx3)
         if self.gtts_available:
-            if self.speak_with_gtts(text):
+            if self.speak_streaming(text, lead):
                 return True
         
         # Fallback to pyttsx3
         if self.pyttsx3_engine:
-            if self.speak_with_pyttsx3(text):
+            if self.speak_with_pyttsx3(f"{lead} {text}" if lead else text):
                 return True
         
         print("❌ No TTS engine available")
@@ -197,16 +670,19 @@ class WorkingLLMTTS:
         
         if not llm_result["success"]:
             print(f"❌ LLM failed: {llm_result['response']}")
+            # The busy message is meant to be heard, not just logged
+            if llm_result["provider"] == "fallback":
+                self.speak_text(llm_result["response"])
             return False
         
         print(f"✅ LLM response ({llm_result['response_time']:.2f}s)")
         
         # Step 2: Speak response
         print("🔊 Converting to speech...")
-        intro_text = "किसान सहायक का जवाब: " + llm_result["response"]
-        
         tts_start = time.time()
-        tts_success = self.speak_text(intro_text)
+        
+        # The intro is spoken on its own so it plays from the audio cache
+        tts_success = self.speak_text(llm_result["response"], lead=INTRO_TEXT)
         tts_time = time.time() - tts_start
         
         # Display results
@@ -253,7 +729,7 @@ class WorkingLLMTTS:
 def main():
     """Main function"""
     try:
-        system = WorkingLLMTTS()
+        system = WorkingLLMTTS(use_cache="--no-cache" not in sys.argv)
         system.run_interactive()
     except Exception as e:
         print(f"❌ System failed: {e}")
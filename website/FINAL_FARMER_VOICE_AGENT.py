@@ -5,50 +5,165 @@ Complete Real-Time Voice Call System for Farmers
 Production Ready - All Tests Passed
 """
 
+import io
 import os
+import re
+import sys
+import gzip
+import json
+import queue
+import base64
+import asyncio
+import hashlib
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import requests
+import httpx
+
+# Sentence splitting, stream parsing and pooled gTTS sessions are shared
+# with the TTS pipelines
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tts model'))
+from tts_common import split_sentences, drop_unfinished, iter_sse_sentences, warm_up_gtts
+
+HTTP2_AVAILABLE = False
+try:
+    import h2  # noqa: F401  Lets httpx speak HTTP/2 to Groq
+    HTTP2_AVAILABLE = True
+except ImportError:
+    pass
+
+GTTS_AVAILABLE = False
+try:
+    from gtts import gTTS
+    GTTS_AVAILABLE = True
+except ImportError:
+    pass
+
+SENTENCE_TRANSFORMERS_AVAILABLE = False
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer  # Optional semantic advice cache
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    pass
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster JSON for Groq requests and responses
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for request bodies and jsonify"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
-# Load API key
+DOTENV_AVAILABLE = False
+try:
+    from dotenv import dotenv_values  # Optional full .env parser
+    DOTENV_AVAILABLE = True
+except ImportError:
+    pass
+
+def load_env(env_file):
+    """Parse every KEY=value setting in a .env file into a dict"""
+    if DOTENV_AVAILABLE:
+        return dotenv_values(env_file)
+    with open(env_file, 'r', encoding='utf-8') as f:
+        return dict(
+            (key.strip(), value.strip())
+            for key, value in (line.split('=', 1) for line in f
+                               if '=' in line and not line.lstrip().startswith('#'))
+        )
+
+# Load API key once at import; under gunicorn, run with --preload so the
+# master parses .env and forked workers inherit the result
 GROQ_API_KEY = None
 try:
     env_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'llm', '.env')
     if os.path.exists(env_file):
-        with open(env_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if 'GROQ_API_KEY=' in line:
-                    GROQ_API_KEY = line.split('=', 1)[1].strip()
-                    break
+        GROQ_API_KEY = (load_env(env_file).get('GROQ_API_KEY') or '').strip() or None
     print(f"✅ API Key: {'READY' if GROQ_API_KEY else 'MISSING'}")
 except Exception as e:
     print(f"❌ API key error: {e}")
 
-def get_farming_advice(query):
-    """Get expert farming advice from AI"""
-    print(f"🌾 Farmer Query: {query}")
+# Groq calls run on one background event loop shared by all requests, so the
+# async client's pooled connections stay on the loop they were opened on
+# (Flask runs each async view in a fresh loop) and many farmer queries can be
+# in flight at once
+def _start_groq_loop():
+    """Start the Groq event loop thread and its HTTP client
     
-    if not GROQ_API_KEY:
-        return "API key की समस्या है, भाई।"
-    
-    try:
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "llama3-70b-8192",
-            "messages": [
-                {
-                    "role": "system", 
-                    "content": """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। 
+    A forked worker (gunicorn --preload) inherits the loop but not the thread
+    running it, so each child starts its own.
+    """
+    global _groq_loop, _async_client
+    _groq_loop = asyncio.new_event_loop()
+    threading.Thread(target=_groq_loop.run_forever, name="groq-loop", daemon=True).start()
+    _async_client = httpx.AsyncClient(
+        timeout=20,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    )
+
+_start_groq_loop()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_start_groq_loop)
+
+# Generated voice is cached on disk by text, so repeated phrases (welcome and
+# error messages) are synthesized only once; least recently used files are
+# removed once the cache grows past its limit
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "farmer_tts_cache")
+CACHE_LIMIT = 50 * 1024 * 1024
+# Cached files are named by a hash of their text, so a URL never changes content
+VOICE_MAX_AGE = 365 * 24 * 60 * 60
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# gTTS calls block on Google's servers, so they run on a bounded worker pool.
+# A forked worker would inherit the pool's bookkeeping but not its threads
+# (queued jobs would never run), so each child gets a fresh pool
+def _new_tts_pool():
+    global _TTS_POOL
+    _TTS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts")
+
+_new_tts_pool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_new_tts_pool)
+
+# Open a pooled gTTS connection to Google before a farmer needs it
+if GTTS_AVAILABLE:
+    _TTS_POOL.submit(warm_up_gtts)
+
+GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_HEADERS = {
+    "Authorization": f"Bearer {GROQ_API_KEY}",
+    "Content-Type": "application/json"
+}
+
+SYSTEM_PROMPT = """आप एक अनुभवी भारतीय कृषि विशेषज्ञ हैं। 
 
 जवाब देने का तरीका:
 - हिंदी में स्पष्ट जवाब दें
@@ -64,47 +179,257 @@ def get_farming_advice(query):
 - सिंचाई और पानी प्रबंधन
 - मंडी भाव और बिक्री
 - मिट्टी की जांच"""
-                },
-                {"role": "user", "content": query}
-            ],
-            "temperature": 0.7,
-            "max_tokens": 150
-        }
-        
-        response = requests.post(url, json=payload, headers=headers, timeout=20)
+
+# Fixed parts of every Groq request, built once; only the user message changes
+_SYS_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+_PAYLOAD_TEMPLATE = {
+    "model": "llama3-70b-8192",
+    "messages": [_SYS_MSG, None],
+    "temperature": 0.7,
+    "max_tokens": 150
+}
+
+def _advice_payload(query, stream=False):
+    """Groq chat request for a farmer query"""
+    payload = _PAYLOAD_TEMPLATE.copy()
+    payload["messages"] = [_SYS_MSG, {"role": "user", "content": query}]
+    payload["stream"] = stream
+    return payload
+
+# Answers are cached in memory: an LRU keyed by the normalized query, plus
+# (with sentence-transformers) a semantic match on question embeddings
+ADVICE_CACHE_SIZE = 512
+SEMANTIC_THRESHOLD = 0.92
+_advice_cache = OrderedDict()
+_advice_embeddings = []  # (unit-length query embedding, answer)
+_advice_lock = threading.Lock()
+_encoder = None
+
+def _load_encoder():
+    """Load the sentence embedding model (takes seconds, so runs in the background)"""
+    global _encoder
+    try:
+        _encoder = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+    except Exception as e:
+        print(f"⚠️ Semantic cache unavailable: {e}")
+
+if SENTENCE_TRANSFORMERS_AVAILABLE:
+    threading.Thread(target=_load_encoder, daemon=True).start()
+
+def _normalize_query(query):
+    """Lowercase, trim and collapse whitespace"""
+    return re.sub(r'\s+', ' ', query.strip().lower())
+
+def _embed_query(key):
+    """Unit-length embedding of a normalized query (None if unavailable)"""
+    if _encoder is None:
+        return None
+    return _encoder.encode(key, convert_to_numpy=True, normalize_embeddings=True)
+
+def cached_advice(query):
+    """Return a cached answer for the query, or None"""
+    key = _normalize_query(query)
+    with _advice_lock:
+        if key in _advice_cache:
+            _advice_cache.move_to_end(key)
+            return _advice_cache[key]
+        embeddings = list(_advice_embeddings)
+    
+    if embeddings:
+        q = _embed_query(key)
+        if q is not None:
+            # Embeddings are unit length, so the dot product is the cosine
+            similarities = np.stack([e for e, _ in embeddings]) @ q
+            best = int(np.argmax(similarities))
+            if similarities[best] > SEMANTIC_THRESHOLD:
+                return embeddings[best][1]
+    return None
+
+def store_advice(query, advice):
+    """Cache an answer in both tiers"""
+    key = _normalize_query(query)
+    q = _embed_query(key)
+    with _advice_lock:
+        _advice_cache[key] = advice
+        _advice_cache.move_to_end(key)
+        if len(_advice_cache) > ADVICE_CACHE_SIZE:
+            _advice_cache.popitem(last=False)
+        if q is not None:
+            _advice_embeddings.append((q, advice))
+            del _advice_embeddings[:-ADVICE_CACHE_SIZE]
+
+async def get_farming_advice(query):
+    """Get expert farming advice from AI"""
+    advice = cached_advice(query)
+    if advice is not None:
+        print(f"✅ AI Response (cached): {advice}")
+        return advice
+    
+    future = asyncio.run_coroutine_threadsafe(_ask_farming_expert(query), _groq_loop)
+    advice, success = await asyncio.wrap_future(future)
+    if success:
+        store_advice(query, advice)
+    return advice
+
+async def _ask_farming_expert(query):
+    """Ask Groq for farming advice (runs on the Groq event loop)
+    
+    Returns (answer, success); on failure the answer is a spoken error message.
+    """
+    print(f"🌾 Farmer Query: {query}")
+    
+    if not GROQ_API_KEY:
+        return "API key की समस्या है, भाई।", False
+    
+    try:
+        response = await _async_client.post(GROQ_URL, content=_json_dumps(_advice_payload(query)),
+                                            headers=GROQ_HEADERS)
         
         if response.status_code == 200:
-            result = response.json()
-            ai_response = result["choices"][0]["message"]["content"].strip()
+            choice = _json_loads(response.content)["choices"][0]
+            ai_response = choice["message"]["content"].strip()
+            if choice.get("finish_reason") == "length":
+                ai_response = drop_unfinished(ai_response)
             print(f"✅ AI Response: {ai_response}")
-            return ai_response
+            return ai_response, True
         else:
             print(f"❌ API Error: {response.status_code}")
-            return "AI में कुछ समस्या है, भाई। फिर से कोशिश करें।"
+            return "AI में कुछ समस्या है, भाई। फिर से कोशिश करें।", False
+            
+    except Exception as e:
+        print(f"❌ Exception: {e}")
+        return "नेटवर्क की समस्या है, भाई। कनेक्शन चेक करें।", False
+
+async def _stream_farming_expert(query, sentences):
+    """Stream Groq's answer, putting each finished sentence on the sentences
+    queue followed by None (runs on the Groq event loop)
+    
+    Returns (answer, success); on failure the error message is queued instead.
+    """
+    print(f"🌾 Farmer Query (streaming): {query}")
+    answer, success = "", False
+    try:
+        if not GROQ_API_KEY:
+            answer = "API key की समस्या है, भाई।"
+            return answer, success
+        
+        async with _async_client.stream("POST", GROQ_URL, content=_json_dumps(_advice_payload(query, stream=True)),
+                                        headers=GROQ_HEADERS) as response:
+            if response.status_code != 200:
+                print(f"❌ API Error: {response.status_code}")
+                answer = "AI में कुछ समस्या है, भाई। फिर से कोशिश करें।"
+                return answer, success
             
+            # Hand off every finished sentence as soon as it arrives
+            parts = []
+            async for sentence in iter_sse_sentences(response.aiter_lines()):
+                parts.append(sentence)
+                sentences.put(sentence)
+            answer, success = " ".join(parts), True
+            print(f"✅ AI Response: {answer}")
+            return answer, success
+    
     except Exception as e:
         print(f"❌ Exception: {e}")
-        return "नेटवर्क की समस्या है, भाई। कनेक्शन चेक करें।"
+        answer = "नेटवर्क की समस्या है, भाई। कनेक्शन चेक करें।"
+        return answer, success
+    
+    finally:
+        if not success:
+            sentences.put(answer)
+        sentences.put(None)
+
+def stream_farming_advice(query):
+    """Yield the answer one sentence at a time, as soon as each is available"""
+    advice = cached_advice(query)
+    if advice is not None:
+        print(f"✅ AI Response (cached): {advice}")
+        yield from split_sentences(advice)
+        return
+    
+    sentences = queue.Queue()
+    future = asyncio.run_coroutine_threadsafe(_stream_farming_expert(query, sentences), _groq_loop)
+    while (sentence := sentences.get()) is not None:
+        yield sentence
+    
+    advice, success = future.result()
+    if success:
+        store_advice(query, advice)
+
+def voice_cache_key(text):
+    """Name of the cached voice file for text (without .mp3)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
 def generate_hindi_voice(text):
-    """Generate Hindi voice from text"""
+    """Generate Hindi voice from text, returning the MP3 bytes"""
     print(f"🔊 Generating voice: {text[:50]}...")
     
+    key = voice_cache_key(text)
+    path = os.path.join(CACHE_DIR, f"{key}.mp3")
+    try:
+        with open(path, 'rb') as f:
+            audio = f.read()
+        print(f"✅ Voice from cache: {path}")
+        return audio
+    except OSError:
+        pass
+    
+    if not GTTS_AVAILABLE:
+        print("❌ Voice generation error: gTTS not installed")
+        return None
+    
     try:
-        from gtts import gTTS
         tts = gTTS(text=text, lang="hi", slow=False)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        tts.save(temp_file.name)
-        print(f"✅ Voice generated: {temp_file.name}")
-        return temp_file.name
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        audio = buffer.getvalue()
+        print(f"✅ Voice generated: {len(audio)} bytes")
     except Exception as e:
         print(f"❌ Voice generation error: {e}")
         return None
+    
+    # The response does not wait for the cache write
+    _TTS_POOL.submit(_save_voice, path, audio)
+    return audio
 
-@app.route('/')
-def index():
-    """Final Farmer Voice Agent Interface"""
-    return """
+def _save_voice(path, audio):
+    """Write generated voice to the cache (skipped if another request already did)"""
+    if os.path.exists(path):
+        return
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        # Write under a unique name first so a half-written file is never read
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        os.replace(temp_path, path)
+        trim_voice_cache()
+    except OSError as e:
+        print(f"⚠️ Voice cache write failed: {e}")
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+def trim_voice_cache():
+    """Delete least recently used voice files while the cache is over its limit"""
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith(".mp3"):
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_LIMIT:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+
+# The call page is static: encoded (and gzip-compressed) once at import
+# instead of on every request
+_INDEX_BYTES = ("""
     <!DOCTYPE html>
     <html lang="hi">
     <head>
@@ -707,26 +1032,46 @@ def index():
                 updateCallStatus('🤖 AI सोच रहा है...', 'speaking');
                 
                 try {
-                    // Get AI response
-                    const response = await fetch('/api/farming-advice', {
+                    // Stream the AI response: each line carries one sentence
+                    // and its voice, played as soon as it arrives
+                    const response = await fetch('/api/farming-advice-stream', {
                         method: 'POST',
                         headers: { 'Content-Type': 'application/json' },
                         body: JSON.stringify({ query: transcript })
                     });
                     
-                    const result = await response.json();
-                    console.log('📦 AI response received:', result.success);
+                    if (!response.ok || !response.body) {
+                        throw new Error('Streaming response failed: ' + response.status);
+                    }
+                    
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    const messageText = addMessage('ai', '');
+                    messageCount++;
                     
-                    if (result.success) {
-                        const aiResponse = result.response;
-                        addMessage('ai', aiResponse);
-                        messageCount++;
-                        await playVoiceResponse(aiResponse);
-                    } else {
-                        const errorMsg = 'माफ करें भाई, कुछ तकनीकी समस्या है। फिर से कोशिश करें।';
-                        addMessage('ai', errorMsg);
-                        await playVoiceResponse(errorMsg);
+                    let buffered = '';
+                    let playback = Promise.resolve();
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) break;
+                        
+                        buffered += decoder.decode(value, { stream: true });
+                        const lines = buffered.split('\\n');
+                        buffered = lines.pop();
+                        
+                        for (const line of lines) {
+                            if (!line.trim()) continue;
+                            const chunk = JSON.parse(line);
+                            console.log('📦 AI sentence received');
+                            messageText.textContent += (messageText.textContent ? ' ' : '') + chunk.text;
+                            if (chunk.audio) {
+                                playback = playback.then(() => playAudioChunk(chunk.audio));
+                            }
+                        }
                     }
+                    
+                    await playback;
+                    finishVoiceResponse();
                 } catch (error) {
                     console.error('❌ Voice processing error:', error);
                     const errorMsg = 'नेटवर्क की समस्या है भाई। कनेक्शन चेक करें।';
@@ -735,6 +1080,32 @@ def index():
                 }
             }
             
+            function playAudioChunk(base64Audio) {
+                // Resolves when this sentence has finished playing
+                return new Promise((resolve) => {
+                    updateCallStatus('🔊 AI बोल रहा है...', 'speaking');
+                    currentAudio = new Audio('data:audio/mpeg;base64,' + base64Audio);
+                    currentAudio.onended = resolve;
+                    currentAudio.onerror = function(e) {
+                        console.error('❌ Audio playback error:', e);
+                        resolve();
+                    };
+                    currentAudio.play().catch(resolve);
+                });
+            }
+            
+            function finishVoiceResponse() {
+                console.log('✅ Voice response finished');
+                currentAudio = null;
+                if (isCallActive) {
+                    updateCallStatus('🎤 Call Connected - आप बोलें!', 'listening');
+                    // Ensure recognition is restarted after audio finishes
+                    recognitionTimeout = setTimeout(() => {
+                        safeStartRecognition();
+                    }, 1200);
+                }
+            }
+            
             async function playVoiceResponse(text) {
                 console.log('🔊 Playing voice response...');
                 updateCallStatus('🔊 AI बोल रहा है...', 'speaking');
@@ -746,9 +1117,19 @@ def index():
                         body: JSON.stringify({ text: text })
                     });
                     
+                    let audioUrl = null;
                     if (response.ok) {
-                        const audioBlob = await response.blob();
-                        const audioUrl = URL.createObjectURL(audioBlob);
+                        if ((response.headers.get('Content-Type') || '').includes('application/json')) {
+                            // Cached voice: the browser loads it from its static URL
+                            const data = await response.json();
+                            audioUrl = data.url || null;
+                        } else {
+                            const audioBlob = await response.blob();
+                            audioUrl = URL.createObjectURL(audioBlob);
+                        }
+                    }
+                    
+                    if (audioUrl) {
                         currentAudio = new Audio(audioUrl);
                         
                         currentAudio.onended = function() {
@@ -806,6 +1187,7 @@ def index():
                 messagesEl.scrollTop = messagesEl.scrollHeight;
                 
                 console.log('💬 Message added:', speakerName);
+                return messageEl.querySelector('.message-text');
             }
             
             // Initialize
@@ -823,10 +1205,22 @@ def index():
         </script>
     </body>
     </html>
-    """
+    """).encode('utf-8')
+_INDEX_GZ = gzip.compress(_INDEX_BYTES, 9)
+
+@app.route('/')
+def index():
+    """Final Farmer Voice Agent Interface"""
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        return Response(_INDEX_GZ, mimetype='text/html', headers={
+            'Content-Encoding': 'gzip',
+            'Content-Length': str(len(_INDEX_GZ)),
+            'Vary': 'Accept-Encoding'
+        })
+    return Response(_INDEX_BYTES, mimetype='text/html', headers={'Vary': 'Accept-Encoding'})
 
 @app.route('/api/farming-advice', methods=['POST'])
-def farming_advice_api():
+async def farming_advice_api():
     """Main farming advice API"""
     print("🌾 === FARMING ADVICE API ===")
     
@@ -838,7 +1232,7 @@ def farming_advice_api():
             return jsonify({"success": False, "error": "Empty query"})
         
         # Get farming advice
-        advice = get_farming_advice(query)
+        advice = await get_farming_advice(query)
         
         return jsonify({
             "success": True,
@@ -850,8 +1244,34 @@ def farming_advice_api():
         print(f"❌ Farming Advice API Error: {e}")
         return jsonify({"success": False, "error": str(e)})
 
+@app.route('/api/farming-advice-stream', methods=['POST'])
+def farming_advice_stream_api():
+    """Farming advice streamed sentence by sentence with its voice
+    
+    Each line of the response is a JSON object with the sentence text and its
+    MP3 audio (base64), sent as soon as that sentence has been spoken by the
+    LLM and synthesized, so the browser can start playing the first sentence
+    while the rest of the answer is still being generated.
+    """
+    print("🌾 === STREAMING FARMING ADVICE API ===")
+    
+    data = request.get_json()
+    query = data.get('query', '').strip()
+    
+    if not query:
+        return jsonify({"success": False, "error": "Empty query"})
+    
+    def generate():
+        for sentence in stream_farming_advice(query):
+            audio = generate_hindi_voice(sentence)
+            if audio:
+                audio = base64.b64encode(audio).decode('ascii')
+            yield _json_dumps({"text": sentence, "audio": audio}) + b"\n"
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/api/generate-voice', methods=['POST'])
-def generate_voice_api():
+async def generate_voice_api():
     """Voice generation API"""
     print("🔊 === VOICE GENERATION API ===")
     
@@ -862,10 +1282,19 @@ def generate_voice_api():
         if not text:
             return jsonify({"success": False, "error": "Empty text"})
         
-        audio_file = generate_hindi_voice(text)
+        # Already cached: point the browser at the static file instead of
+        # sending the audio through this handler
+        key = voice_cache_key(text)
+        if os.path.exists(os.path.join(CACHE_DIR, f"{key}.mp3")):
+            print(f"✅ Voice from cache: /tts/{key}.mp3")
+            return jsonify({"success": True, "url": f"/tts/{key}.mp3"})
+        
+        loop = asyncio.get_running_loop()
+        audio = await loop.run_in_executor(_TTS_POOL, generate_hindi_voice, text)
         
-        if audio_file:
-            return send_file(audio_file, as_attachment=True, download_name="voice_response.mp3")
+        if audio:
+            return send_file(io.BytesIO(audio), mimetype="audio/mpeg", as_attachment=True,
+                             download_name="voice_response.mp3")
         else:
             return jsonify({"success": False, "error": "Voice generation failed"})
             
@@ -873,6 +1302,15 @@ def generate_voice_api():
         print(f"❌ Voice Generation API Error: {e}")
         return jsonify({"success": False, "error": str(e)})
 
+@app.route('/tts/<key>.mp3')
+def cached_voice(key):
+    """Serve a cached voice file; its content never changes, so browsers
+    and proxies may keep it for a year"""
+    response = send_from_directory(CACHE_DIR, f"{key}.mp3", mimetype="audio/mpeg",
+                                   max_age=VOICE_MAX_AGE, conditional=True)
+    response.headers["Cache-Control"] = f"public, max-age={VOICE_MAX_AGE}, immutable"
+    return response
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """System health check"""
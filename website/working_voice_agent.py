@@ -4,12 +4,35 @@ Working Voice Agent - New Approach
 Guaranteed working voice call system for farmers
 """
 
+import io
 import os
-import tempfile
+import json
 from datetime import datetime
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
-import requests
+import httpx
+
+HTTP2_AVAILABLE = False
+try:
+    import h2  # noqa: F401  Lets httpx speak HTTP/2 to Groq
+    HTTP2_AVAILABLE = True
+except ImportError:
+    pass
+
+ORJSON_AVAILABLE = False
+try:
+    import orjson  # Optional faster JSON for Groq requests and responses
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+if ORJSON_AVAILABLE:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    _json_loads = json.loads
 
 app = Flask(__name__)
 CORS(app)
@@ -28,6 +51,28 @@ try:
 except Exception as e:
     print(f"❌ API key error: {e}")
 
+# One client for all Groq calls: keep-alive connections are pooled, so only
+# the first farmer query pays for the TCP + TLS handshake, and with HTTP/2
+# concurrent queries share a single multiplexed connection
+_groq = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    timeout=15,
+    headers={"Authorization": f"Bearer {GROQ_API_KEY}", "Content-Type": "application/json"},
+    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+)
+
+# Fixed parts of every Groq request, built once; only the user message changes
+_SYS_MSG = {
+    "role": "system",
+    "content": "आप एक भारतीय कृषि विशेषज्ञ हैं। हिंदी में 2-3 वाक्य में practical सलाह दें। 'भाई' या 'जी' का use करें।"
+}
+_PAYLOAD_TEMPLATE = {
+    "model": "llama3-70b-8192",
+    "messages": [_SYS_MSG, None],
+    "temperature": 0.7,
+    "max_tokens": 100
+}
+
 def get_farming_advice(query):
     """Get farming advice from AI"""
     print(f"🌾 Farmer Query: {query}")
@@ -37,28 +82,14 @@ def get_farming_advice(query):
     
     try:
         url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
         
-        payload = {
-            "model": "llama3-70b-8192",
-            "messages": [
-                {
-                    "role": "system", 
-                    "content": "आप एक भारतीय कृषि विशेषज्ञ हैं। हिंदी में 2-3 वाक्य में practical सलाह दें। 'भाई' या 'जी' का use करें।"
-                },
-                {"role": "user", "content": query}
-            ],
-            "temperature": 0.7,
-            "max_tokens": 100
-        }
+        payload = _PAYLOAD_TEMPLATE.copy()
+        payload["messages"] = [_SYS_MSG, {"role": "user", "content": query}]
         
-        response = requests.post(url, json=payload, headers=headers, timeout=15)
+        response = _groq.post(url, content=_json_dumps(payload))
         
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             advice = result["choices"][0]["message"]["content"].strip()
             print(f"✅ AI Advice: {advice}")
             return advice
@@ -71,16 +102,16 @@ def get_farming_advice(query):
         return "नेटवर्क की समस्या है।"
 
 def create_audio(text):
-    """Create audio from text"""
+    """Create audio from text, returning the MP3 bytes"""
     print(f"🔊 Creating audio: {text}")
     
     try:
         from gtts import gTTS
         tts = gTTS(text=text, lang="hi", slow=False)
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        tts.save(temp_file.name)
-        print(f"✅ Audio created: {temp_file.name}")
-        return temp_file.name
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        print(f"✅ Audio created: {buffer.tell()} bytes")
+        return buffer.getvalue()
     except Exception as e:
         print(f"❌ Audio error: {e}")
         return None
@@ -513,10 +544,11 @@ def handle_audio():
         if not text:
             return jsonify({"success": False, "error": "Empty text"})
         
-        audio_file = create_audio(text)
+        audio = create_audio(text)
         
-        if audio_file:
-            return send_file(audio_file, as_attachment=True, download_name="response.mp3")
+        if audio:
+            return send_file(io.BytesIO(audio), mimetype="audio/mpeg", as_attachment=True,
+                             download_name="response.mp3")
         else:
             return jsonify({"success": False, "error": "Audio generation failed"})
             